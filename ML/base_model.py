@@ -12,7 +12,7 @@ class BaseWordleModel(ABC):
     """
     Abstract base class for supervised Wordle ML models.
 
-    Subclasses implement train() and predict(); this class provides the shared
+    Subclasses implement train() and predict_batch(); this class provides the shared
     make_guess() loop, feature engineering, and save/load helpers.
     """
 
@@ -38,6 +38,18 @@ class BaseWordleModel(ABC):
         pass
 
     @abstractmethod
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        """
+        Predict letter affinity scores for many game states in one model call.
+
+        Args:
+            features: Shape (K, 314) — one engineer_features() row per game.
+
+        Returns:
+            np.ndarray: Shape (K, 26) — score for each letter A-Z, per game.
+        """
+        pass
+
     def predict(self, game_state: GameState) -> np.ndarray:
         """
         Predict letter affinity scores for the current game state.
@@ -45,7 +57,7 @@ class BaseWordleModel(ABC):
         Returns:
             np.ndarray: Shape (26,) — score for each letter A-Z.
         """
-        pass
+        return self.predict_batch(self.engineer_features(game_state).reshape(1, -1))[0]
 
     def make_guess(self) -> str:
         """
@@ -55,29 +67,40 @@ class BaseWordleModel(ABC):
         When few words remain the candidate pool shrinks to remaining_words only,
         avoiding expensive full-vocabulary scoring and reducing trap risk.
         """
-        letter_probs = self.predict(self.game_state)
-        self.game_state.guess_count += 1
-
-        if len(self.game_state.remaining_words) == 1:
-            return self.game_state.remaining_words[0]
-
-        if len(self.game_state.remaining_words) > SACRIFICIAL_THRESHOLD:
-            candidate_pool = self.game_state.master_list
-        else:
-            candidate_pool = self.game_state.remaining_words
+        return self.make_guesses([self.game_state])[0]
 
-        best_word = None
-        best_score = -1
+    def make_guesses(self, game_states: list[GameState]) -> list[str]:
+        """
+        make_guess() for several independent games, with one predict_batch() call for all of them.
 
-        for word in candidate_pool:
-            score = sum(letter_probs[ord(letter) - ord('a')] for letter in set(word))
-            if word in self.game_state.remaining_words:
-                score += ANSWER_BONUS
-            if score > best_score:
-                best_word = word
-                best_score = score
+        Args:
+            game_states: States of the games to guess for; each one's guess_count is advanced.
 
-        return best_word
+        Returns:
+            list[str]: The guess for each game, in the same order.
+        """
+        features = np.stack([self.engineer_features(game_state) for game_state in game_states])
+        letter_probs = self.predict_batch(features)
+
+        guesses = []
+        for game_state, probs in zip(game_states, letter_probs):
+            game_state.guess_count += 1
+            guesses.append(self._best_word(game_state, probs))
+        return guesses
+
+    def _best_word(self, game_state: GameState, letter_probs: np.ndarray) -> str:
+        remaining_indices = game_state.remaining_words_indices
+        if len(remaining_indices) == 1:
+            return game_state.master_list[remaining_indices[0]]
+
+        # The vocabulary's letter incidence is shared through GameState rather than stored here,
+        # so it is never written into saved models.
+        scores = (game_state.letter_incidence @ letter_probs.astype(np.float32)
+                  + ANSWER_BONUS * game_state.remaining_mask)
+        # argmax keeps the first of equal scores, i.e. the earliest word in master_list order.
+        if len(remaining_indices) > SACRIFICIAL_THRESHOLD:
+            return game_state.master_list[np.argmax(scores)]
+        return game_state.master_list[remaining_indices[np.argmax(scores[remaining_indices])]]
 
     def save(self, filepath: Path, keep_game_state: bool) -> None:
         """Save trained model to disk using joblib."""
@@ -2,13 +2,23 @@ from pathlib import Path
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
 import numpy as np
-from collections import deque
 import random
 
+from ML.replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
 from Utilities.game_state import GameState
-from Utilities.shared_utils import extract_features, filter_words, score_guess, FEATURE_SIZE, MAX_GUESSES
+from Utilities.shared_utils import (extract_features, filter_words, score_guess, encode_words,
+                                    FEATURE_SIZE, MAX_GUESSES)
+
+_REPLAY_CAPACITY = 10000
+# Output layers DQNBot can use: one row per word, or summed letter-position embeddings.
+FULL_HEAD = 'full'
+LETTER_POSITION_HEAD = 'letter_position'
+# Self-play games stepped together during training; one forward pass picks all their actions.
+_NUM_ENVS = 8
+DQN_MODEL_PATH = Path('ML/saved_models/dqn_bot.pth')
 
 
 def calculate_reward(won: bool, done: bool, guess_count: int,
@@ -45,23 +55,82 @@ class QNetwork(nn.Module):
         self.fc2 = nn.Linear(256, 128)
         self.fc3 = nn.Linear(128, action_size)
 
+    def encode(self, x):
+        """Shared state representation, shape (batch, 128)."""
+        x = torch.relu(self.fc1(x))
+        return torch.relu(self.fc2(x))
+
+    def head(self, h, candidate_indices=None):
+        """Q-values from encode() output, for every word or only candidate_indices."""
+        if candidate_indices is None:
+            return self.fc3(h)
+        candidate_indices = torch.as_tensor(candidate_indices)
+        return F.linear(h, self.fc3.weight[candidate_indices], self.fc3.bias[candidate_indices])
+
     def forward(self, x):
+        return self.head(self.encode(x))
+
+
+class LetterPositionQNetwork(nn.Module):
+    """
+    Q-network whose output layer scores words through letter-position embeddings.
+
+    Instead of one output row per word, the state representation is scored against an
+    embedding for each of the 5×26 (position, letter) pairs, and a word's Q-value is the
+    sum of its five pair scores. The head therefore has 130 outputs whatever the
+    vocabulary size, and words added later are scored without retraining the layer.
+    """
+
+    def __init__(self, state_size: int, word_list: list[str]):
+        super().__init__()
+        self.fc1 = nn.Linear(state_size, 256)
+        self.fc2 = nn.Linear(256, 128)
+        self.letter_position = nn.Linear(128, 5 * 26)
+        # The five (position, letter) slots of each word, as (N, 5) indices for scoring a few
+        # candidates and as a (130, N) 0/1 matrix so scoring every word is one matrix product.
+        # Both are rebuilt from word_list rather than saved.
+        slots = torch.from_numpy(encode_words(word_list).astype(np.int64)) + torch.arange(5) * 26
+        incidence = torch.zeros(5 * 26, len(word_list))
+        incidence[slots, torch.arange(len(word_list))[:, None]] = 1.0
+        self.register_buffer('word_slots', slots, persistent=False)
+        self.register_buffer('slot_incidence', incidence, persistent=False)
+
+    def encode(self, x):
+        """Shared state representation, shape (batch, 128)."""
         x = torch.relu(self.fc1(x))
-        x = torch.relu(self.fc2(x))
-        return self.fc3(x)
+        return torch.relu(self.fc2(x))
+
+    def head(self, h, candidate_indices=None):
+        """Q-values from encode() output, for every word or only candidate_indices."""
+        slot_scores = self.letter_position(h)
+        if candidate_indices is None:
+            return slot_scores @ self.slot_incidence
+        return slot_scores[:, self.word_slots[torch.as_tensor(candidate_indices)]].sum(dim=-1)
+
+    def forward(self, x):
+        return self.head(self.encode(x))
 
 
 class DQNBot:
-    def __init__(self, word_list: list[str]):
+    def __init__(self, word_list: list[str], prioritized_replay: bool = False, head: str = FULL_HEAD,
+                 shortlist: bool = True):
+        """
+        Args:
+            word_list: Vocabulary; one Q-value output per word.
+            prioritized_replay: Sample replayed transitions by TD error instead of uniformly.
+            head: FULL_HEAD or LETTER_POSITION_HEAD output layer for a newly trained network.
+                A saved checkpoint's own head takes precedence when it is loaded.
+            shortlist: When choosing greedy actions, compute Q only for each game's remaining
+                words instead of for the whole vocabulary.
+        """
         self.game_state = GameState(word_list)
-        self.model_path = Path('ML/saved_models/dqn_bot.pth')
+        self.model_path = DQN_MODEL_PATH
         self.is_trained = False
 
         self.state_size = FEATURE_SIZE
         self.action_size = len(word_list)
-        self.q_network = QNetwork(self.state_size, self.action_size)
-        self.target_network = QNetwork(self.state_size, self.action_size)
-        self.target_network.load_state_dict(self.q_network.state_dict())
+        self.shortlist = shortlist
+        self._build_networks(head)
 
         self.gamma = 0.97
         self.epsilon = 0.95
@@ -72,44 +141,78 @@ class DQNBot:
         self.training_steps = 0
         self.optimizer = optim.Adam(self.q_network.parameters(), lr=self.learning_rate)
 
-        self.replay_buffer = deque(maxlen=10000)
+        # Per-sample squared errors, so prioritized replay can weight them before averaging.
+        self.loss_fn = nn.MSELoss(reduction='none')
+        buffer_type = PrioritizedReplayBuffer if prioritized_replay else ReplayBuffer
+        self.replay_buffer = buffer_type(_REPLAY_CAPACITY, self.state_size)
         self.batch_size = 64
 
+    def _build_networks(self, head: str) -> None:
+        if head == FULL_HEAD:
+            self.q_network = QNetwork(self.state_size, self.action_size)
+            self.target_network = QNetwork(self.state_size, self.action_size)
+        elif head == LETTER_POSITION_HEAD:
+            self.q_network = LetterPositionQNetwork(self.state_size, self.game_state.master_list)
+            self.target_network = LetterPositionQNetwork(self.state_size, self.game_state.master_list)
+        else:
+            raise ValueError(f"Unknown Q-network head: {head}")
+        self.head = head
+        self.target_network.load_state_dict(self.q_network.state_dict())
+
     def choose_action(self, epsilon: float) -> str:
         if random.random() < epsilon:
             return random.choice(self.game_state.remaining_words)
+        return self.greedy_actions([self.game_state])[0]
 
-        state_tensor = torch.FloatTensor(extract_features(self.game_state).reshape(1, -1))
-        with torch.no_grad():
-            q_values = self.q_network(state_tensor)
+    def greedy_actions(self, game_states: list[GameState], features: list[np.ndarray] = None) -> list[str]:
+        """
+        Highest-Q remaining word for each game, from a single forward pass over all of them.
 
-        # Only consider words still in play; map back to master_list index.
-        remaining_q = q_values[0, self.game_state.remaining_words_indices]
-        word_idx = self.game_state.remaining_words_indices[torch.argmax(remaining_q).item()]
-        return self.game_state.master_list[word_idx]
+        Args:
+            game_states: Games to act in.
+            features: extract_features() of each game, when the caller already has them.
+        """
+        if features is None:
+            features = [extract_features(game_state) for game_state in game_states]
+        state_tensor = torch.FloatTensor(np.stack(features))
+        with torch.no_grad():
+            encoded = self.q_network.encode(state_tensor)
+            q_values = None if self.shortlist else self.q_network.head(encoded)
+
+            actions = []
+            for i, game_state in enumerate(game_states):
+                # Only consider words still in play; map back to master_list index.
+                remaining_indices = game_state.remaining_words_indices
+                if q_values is not None:
+                    remaining_q = q_values[i, remaining_indices]
+                elif len(remaining_indices) == self.action_size:
+                    remaining_q = self.q_network.head(encoded[i:i + 1])[0]
+                else:
+                    remaining_q = self.q_network.head(encoded[i:i + 1], remaining_indices)[0]
+                word_idx = remaining_indices[torch.argmax(remaining_q).item()]
+                actions.append(game_state.master_list[word_idx])
+        return actions
 
     def store_experience(self, state: np.ndarray, action_idx: int, reward: float,
                          next_state: np.ndarray, done: bool) -> None:
-        self.replay_buffer.append((state, action_idx, reward, next_state, done))
+        self.replay_buffer.add(state, action_idx, reward, next_state, done)
 
-    def train_step(self) -> float:
+    def train_step(self, batch_size: int = None) -> float:
         """
         Sample a minibatch from the replay buffer and perform one gradient update.
 
+        Args:
+            batch_size: Minibatch size; defaults to self.batch_size.
+
         Returns:
             float: MSE loss for monitoring.
         """
-        if len(self.replay_buffer) < self.batch_size:
+        batch_size = batch_size or self.batch_size
+        if len(self.replay_buffer) < batch_size:
             return 0.0
 
-        batch = random.sample(self.replay_buffer, self.batch_size)
-        states, actions, rewards, next_states, dones = zip(*batch)
-
-        states_t = torch.FloatTensor(np.array(states))
-        actions_t = torch.LongTensor(np.array(actions))
-        rewards_t = torch.FloatTensor(np.array(rewards))
-        next_states_t = torch.FloatTensor(np.array(next_states))
-        dones_t = torch.FloatTensor(np.array(dones))
+        indices, batch, weights = self.replay_buffer.sample(batch_size)
+        states_t, actions_t, rewards_t, next_states_t, dones_t = (torch.from_numpy(field) for field in batch)
 
         current_q = self.q_network(states_t).gather(1, actions_t.unsqueeze(1)).squeeze(1)
 
@@ -118,7 +221,8 @@ class DQNBot:
             max_next_q = self.target_network(next_states_t).max(1)[0]
         target_q = rewards_t + self.gamma * max_next_q * (1 - dones_t)
 
-        loss = nn.MSELoss()(current_q, target_q)
+        loss = (torch.from_numpy(weights) * self.loss_fn(current_q, target_q)).mean()
+        self.replay_buffer.update_priorities(indices, (target_q - current_q).detach().numpy())
         self.optimizer.zero_grad()
         loss.backward()
         torch.nn.utils.clip_grad_norm_(self.q_network.parameters(), max_norm=1.0)
@@ -131,57 +235,97 @@ class DQNBot:
         return loss.item()
 
     def make_guess(self) -> str:
-        guess = self.choose_action(epsilon=0)
-        self.game_state.guess_count += 1
-        return guess
+        return self.make_guesses([self.game_state])[0]
 
-    def train(self, num_episodes: int = 1000) -> None:
+    def make_guesses(self, game_states: list[GameState]) -> list[str]:
+        """Greedy guess for each of several independent games, advancing each one's guess_count."""
+        guesses = self.greedy_actions(game_states)
+        for game_state in game_states:
+            game_state.guess_count += 1
+        return guesses
+
+    def train(self, num_episodes: int = 1000, num_envs: int = _NUM_ENVS) -> None:
         """
-        Train via self-play: play num_episodes games, storing experiences and
-        updating the Q-network after each guess.
+        Train via self-play: play num_episodes games, num_envs at a time, storing
+        experiences and updating the Q-network as they are played.
+
+        Each step picks the actions of every running game with one forward pass, then
+        makes one gradient update on batch_size samples per game stepped. Every new
+        transition is therefore replayed as often as with one game at a time, while the
+        optimizer runs num_envs times less often. A finished game is immediately
+        replaced by a new one until num_episodes have been started.
 
         Args:
             num_episodes: Number of games to simulate.
+            num_envs: Games stepped together.
         """
         if self.model_path.exists():
             self.load(self.model_path)
+            self.q_network.eval()
             return
 
-        for i in range(num_episodes):
-            self.game_state.reset()
-            answer = random.choice(self.game_state.master_list)
-            loss = 0
+        word_list = self.game_state.master_list
+        game_states = [GameState(word_list, self.game_state.word_to_index) for _ in range(min(num_envs, num_episodes))]
+        answers = [random.choice(word_list) for _ in game_states]
+        # Features of each game's current state; a step's post-state is the next step's pre-state.
+        states = [extract_features(game_state) for game_state in game_states]
+        started = len(game_states)
+        finished = 0
+        loss = 0
+
+        while game_states:
+            guesses = self._explore_or_exploit(game_states, states)
 
-            while self.game_state.guess_count < MAX_GUESSES:
-                pre_state = extract_features(self.game_state)
-                words_before = len(self.game_state.remaining_words)
-                guess = self.choose_action(self.epsilon)
-                self.game_state.guess_count += 1
+            running = []
+            for game_state, answer, pre_state, guess in zip(game_states, answers, states, guesses):
+                words_before = game_state.remaining_count
+                game_state.guess_count += 1
 
                 score = score_guess(answer, guess)
-                filter_words(guess, score, self.game_state)
-                words_after = len(self.game_state.remaining_words)
-                post_state = extract_features(self.game_state)
+                filter_words(guess, score, game_state)
+                words_after = game_state.remaining_count
+                post_state = extract_features(game_state)
 
                 won = guess == answer
-                lost = not won and self.game_state.guess_count >= MAX_GUESSES
+                lost = not won and game_state.guess_count >= MAX_GUESSES
                 done = won or lost
-                reward = calculate_reward(won, done, self.game_state.guess_count,
-                                          words_before, words_after)
-                self.store_experience(pre_state, self.game_state.word_to_index[guess],
-                                      reward, post_state, done)
-                loss = self.train_step()
-                if done:
-                    break
-
-            self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
-            if (i + 1) % 100 == 0:
-                print(f"Episode {i + 1}/{num_episodes} | Epsilon: {self.epsilon:.3f} | Loss: {loss:.4f}")
+                reward = calculate_reward(won, done, game_state.guess_count, words_before, words_after)
+                self.store_experience(pre_state, game_state.word_to_index[guess], reward, post_state, done)
+
+                if not done:
+                    running.append((game_state, answer, post_state))
+                    continue
+
+                finished += 1
+                self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
+                if finished % 100 == 0:
+                    print(f"Episode {finished}/{num_episodes} | Epsilon: {self.epsilon:.3f} | Loss: {loss:.4f}")
+                if started < num_episodes:
+                    game_state.reset()
+                    running.append((game_state, random.choice(word_list), extract_features(game_state)))
+                    started += 1
+
+            loss = self.train_step(self.batch_size * len(game_states))
+            game_states, answers, states = (list(column) for column in zip(*running)) if running else ([], [], [])
 
         self.is_trained = True
+        self.q_network.eval()
         self.save(self.model_path)
         print("Training complete!")
 
+    def _explore_or_exploit(self, game_states: list[GameState], features: list[np.ndarray]) -> list[str]:
+        """Epsilon-greedy action per game, with one forward pass for all the greedy ones."""
+        explore = [random.random() < self.epsilon for _ in game_states]
+        exploit = [i for i, explored in enumerate(explore) if not explored]
+
+        actions = [random.choice(game_state.remaining_words) if explored else None
+                   for game_state, explored in zip(game_states, explore)]
+        if exploit:
+            greedy = self.greedy_actions([game_states[i] for i in exploit], [features[i] for i in exploit])
+            for i, action in zip(exploit, greedy):
+                actions[i] = action
+        return actions
+
     def save(self, filepath: Path) -> None:
         torch.save({
             'q_network_state_dict': self.q_network.state_dict(),
@@ -190,11 +334,23 @@ class DQNBot:
             'epsilon': self.epsilon,
             'training_steps': self.training_steps,
             'is_trained': self.is_trained,
+            'head': self.head,
         }, filepath)
         print(f"Model saved to {filepath}")
 
+    @staticmethod
+    def saved_head(filepath: Path = DQN_MODEL_PATH) -> str | None:
+        """Output head of the checkpoint saved at filepath, or None when there is none."""
+        if not filepath.exists():
+            return None
+        return torch.load(filepath, map_location='cpu').get('head', FULL_HEAD)
+
     def load(self, filepath: Path) -> None:
-        checkpoint = torch.load(filepath)
+        checkpoint = torch.load(filepath, map_location='cpu')
+        head = checkpoint.get('head', FULL_HEAD)
+        if head != self.head:
+            self._build_networks(head)
+            self.optimizer = optim.Adam(self.q_network.parameters(), lr=self.learning_rate)
         self.q_network.load_state_dict(checkpoint['q_network_state_dict'])
         self.target_network.load_state_dict(checkpoint['target_network_state_dict'])
         self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
@@ -4,31 +4,47 @@ from Utilities.game_state import GameState
 from Utilities.shared_utils import (get_high_frequency_candidates,
                                     SACRIFICIAL_THRESHOLD, HIGH_FREQ_TOP_N, ANSWER_BONUS)
 
+# Number of distinct Wordle feedback patterns (3^5); one histogram bin each.
+_PATTERN_COUNT = 243
+
 
 class EntropyBot:
-    def __init__(self, word_list: list[str], pattern_table: np.ndarray) -> None:
+    def __init__(self, word_list: list[str], pattern_table: np.ndarray, guess_cache=None) -> None:
+        """
+        Args:
+            word_list: Vocabulary of guesses and answers.
+            pattern_table: Precomputed pattern table for word_list.
+            guess_cache: Optional GuessCache memoizing decisions by game history.
+        """
         self.game_state = GameState(word_list)
         self.pattern_table = pattern_table
+        self.guess_cache = guess_cache
 
-    def calculate_entropy(self, guess: str) -> float:
+    def calculate_entropies(self, candidate_indices: np.ndarray) -> np.ndarray:
         """
-        Compute the Shannon entropy of the pattern distribution for a given guess
-        over the current remaining words.
+        Expected bits of information from each candidate guess over the remaining words.
+
+        Gathers the [candidates × remaining] pattern submatrix once, then shifts each row
+        into its own block of 243 bins so a single bincount builds every row's histogram.
 
         Args:
-            guess: Word to evaluate.
+            candidate_indices: master_list indices of the guesses to evaluate.
 
         Returns:
-            float: Expected bits of information gained by guessing this word.
+            np.ndarray: Entropy of each candidate, in the same order.
         """
-        guess_idx = self.game_state.word_to_index[guess]
-        possible_patterns = self.pattern_table[guess_idx, self.game_state.remaining_words_indices]
+        remaining_indices = self.game_state.remaining_words_indices
+        patterns = self.pattern_table[np.ix_(candidate_indices, remaining_indices)]
 
-        counts = np.bincount(possible_patterns)
-        active_counts = counts[counts > 0]
-        probabilities = active_counts / len(self.game_state.remaining_words_indices)
+        offsets = np.arange(len(candidate_indices)) * _PATTERN_COUNT
+        counts = np.bincount((patterns + offsets[:, None]).ravel(),
+                             minlength=len(candidate_indices) * _PATTERN_COUNT)
 
-        return np.sum(-probabilities * np.log2(probabilities))
+        # Only occupied bins contribute; sum their -p·log2(p) terms back into their rows.
+        active_bins = np.flatnonzero(counts)
+        probabilities = counts[active_bins] / len(remaining_indices)
+        return -np.bincount(active_bins // _PATTERN_COUNT, weights=probabilities * np.log2(probabilities),
+                            minlength=len(candidate_indices))
 
     def make_guess(self) -> str:
         """
@@ -47,21 +63,26 @@ class EntropyBot:
         if len(remaining) == 1:
             return remaining[0]
 
+        history = None
+        if self.guess_cache is not None:
+            history = self.guess_cache.history_key(self.game_state)
+            cached_guess = self.guess_cache.get(history)
+            if cached_guess is not None:
+                return cached_guess
+
         if len(remaining) > SACRIFICIAL_THRESHOLD:
             candidates = get_high_frequency_candidates(self.game_state, HIGH_FREQ_TOP_N,
                                                        self.game_state.master_list)
         else:
             candidates = self.game_state.master_list
 
-        best_word = ""
-        max_entropy = -1
+        candidate_indices = np.array([self.game_state.word_to_index[word] for word in candidates])
+        is_answer = self.game_state.remaining_mask[candidate_indices]
 
-        for word in candidates:
-            entropy = self.calculate_entropy(word)
-            if word in remaining:
-                entropy += ANSWER_BONUS
-            if entropy > max_entropy:
-                max_entropy = entropy
-                best_word = word
+        scores = self.calculate_entropies(candidate_indices) + ANSWER_BONUS * is_answer
+        # argmax keeps the first of equal scores, matching candidate order.
+        best_word = self.game_state.master_list[candidate_indices[np.argmax(scores)]]
 
+        if self.guess_cache is not None:
+            self.guess_cache.put(history, best_word)
         return best_word
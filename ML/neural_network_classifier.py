@@ -1,16 +1,23 @@
-import pickle
+import os
 from pathlib import Path
 
 import numpy as np
 import torch
 import torch.nn as nn
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
 
 from ML.base_model import BaseWordleModel
-from Utilities.game_state import GameState
 from Utilities.shared_utils import FEATURE_SIZE
+from Utilities.training_dataset import load_training_dataset, training_dataset_header
 
-_TRAINING_EPOCHS = 1000
-_LOG_INTERVAL = 100
+_BATCH_SIZE = 256
+_MAX_EPOCHS = 200
+_LEARNING_RATE = 0.001
+# Fraction of the examples held out to measure validation loss after every epoch.
+_VALIDATION_FRACTION = 0.1
+# Stop after this many epochs without a new best validation loss.
+_EARLY_STOPPING_PATIENCE = 10
+_SPLIT_SEED = 0
 
 
 class NeuralNetwork(nn.Module):
@@ -29,23 +36,70 @@ class NeuralNetwork(nn.Module):
         return self.network(x)
 
 
+class _MemmapBatches(Dataset):
+    """
+    Rows of the memory-mapped training arrays, fetched a whole batch at a time.
+
+    Indexed with a list of row numbers (from a BatchSampler), so each batch is a single
+    fancy-indexed read of the memmap rather than one small read per example.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, indices: np.ndarray) -> None:
+        self.x = x
+        self.y = y
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, batch: list[int]) -> tuple[torch.Tensor, torch.Tensor]:
+        rows = np.sort(self.indices[batch])
+        return torch.from_numpy(self.x[rows]), torch.from_numpy(self.y[rows])
+
+
+def _batches(x: np.ndarray, y: np.ndarray, indices: np.ndarray, batch_size: int, shuffle: bool) -> DataLoader:
+    dataset = _MemmapBatches(x, y, indices)
+    sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+    return DataLoader(dataset, sampler=BatchSampler(sampler, batch_size, drop_last=False), batch_size=None)
+
+
 class NeuralNetworkClassifier(BaseWordleModel):
     def __init__(self, word_list: list[str]):
         super().__init__(model_name="Neural Network Classifier", word_list=word_list)
         self._model = NeuralNetwork()
         self.model_path = Path('ML/saved_models/neural_network.pkl')
-
-    def train(self):
+        self.checkpoint_path = Path('ML/saved_models/neural_network_checkpoint.pt')
+
+    def train(self, batch_size: int = _BATCH_SIZE, max_epochs: int = _MAX_EPOCHS,
+              validation_fraction: float = _VALIDATION_FRACTION,
+              patience: int = _EARLY_STOPPING_PATIENCE, shuffle: bool = True):
+        """
+        Load the saved model, or fit one with mini-batches streamed from the on-disk dataset.
+
+        A fixed random split holds out validation_fraction of the examples. After every
+        epoch the training state is checkpointed to checkpoint_path, so an interrupted run
+        resumes from its last finished epoch. A checkpoint written for a different dataset,
+        batch_size or validation_fraction is discarded and training starts over. Training stops after max_epochs, or once
+        validation loss has not improved for `patience` epochs, and keeps the weights
+        from the best validation epoch.
+
+        Args:
+            batch_size: Examples per gradient step.
+            max_epochs: Upper bound on passes over the training split.
+            validation_fraction: Share of examples held out for validation.
+            patience: Epochs without validation improvement before stopping early.
+            shuffle: Reshuffle the training split every epoch.
+        """
         if self.model_path.exists():
             saved_bot = self.load(self.model_path)
             self._model = saved_bot._model
+            self._model.eval()
             self.is_trained = True
             return
 
         print("Training Model... this might take a bit")
         try:
-            with open('ML/training_data/wordle_training.pkl', 'rb') as f:
-                training_data = pickle.load(f)
+            x, y = load_training_dataset()
         except FileNotFoundError:
             print("Error: Training data not found. Please generate training data first.")
             exit()
@@ -53,33 +107,79 @@ class NeuralNetworkClassifier(BaseWordleModel):
             print(f"An unexpected error occurred while loading the training data: {e}")
             exit()
 
-        x = np.array([example[0] for example in training_data])
-        y = np.array([example[1] for example in training_data])
-        x_tensor = torch.tensor(x, dtype=torch.float32)
-        y_tensor = torch.tensor(y, dtype=torch.float32)
+        order = np.random.default_rng(_SPLIT_SEED).permutation(len(x))
+        validation_size = int(len(x) * validation_fraction)
+        validation_indices, training_indices = order[:validation_size], order[validation_size:]
+        training_batches = _batches(x, y, training_indices, batch_size, shuffle)
+        validation_batches = _batches(x, y, validation_indices, batch_size, False)
 
         criterion = nn.BCELoss()
-        optimizer = torch.optim.Adam(self._model.parameters(), lr=0.001)
-
-        for i in range(_TRAINING_EPOCHS):
-            loss = self._train_epoch(optimizer, criterion, x_tensor, y_tensor)
-            if i % _LOG_INTERVAL == 0:
-                print(f"Loss: {loss} at epoch {i}")
-
+        optimizer = torch.optim.Adam(self._model.parameters(), lr=_LEARNING_RATE)
+        state = {'epoch': 0, 'best_loss': float('inf'), 'best_state': None, 'stale_epochs': 0}
+        # What a checkpoint must have been trained on for this run to continue it.
+        run = {'dataset': training_dataset_header(), 'batch_size': batch_size,
+               'validation_fraction': validation_fraction}
+        if self.checkpoint_path.exists():
+            checkpoint = torch.load(self.checkpoint_path, map_location='cpu')
+            if checkpoint.get('run') == run:
+                self._model.load_state_dict(checkpoint['model_state_dict'])
+                optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
+                state = checkpoint['state']
+                print(f"Resuming from checkpoint at epoch {state['epoch']}")
+            else:
+                print("Discarding checkpoint: it was written for other training data or settings")
+
+        while state['epoch'] < max_epochs and state['stale_epochs'] < patience:
+            training_loss = self._train_epoch(optimizer, criterion, training_batches)
+            validation_loss = self._evaluate_loss(criterion, validation_batches) if validation_size else training_loss
+            state['epoch'] += 1
+
+            if validation_loss < state['best_loss']:
+                state['best_loss'] = validation_loss
+                state['best_state'] = {name: tensor.clone() for name, tensor in self._model.state_dict().items()}
+                state['stale_epochs'] = 0
+            else:
+                state['stale_epochs'] += 1
+            print(f"Epoch {state['epoch']}: training loss {training_loss:.4f}, validation loss {validation_loss:.4f}")
+
+            # Written aside and renamed, so an interruption never leaves a torn checkpoint.
+            tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+            torch.save({
+                'model_state_dict': self._model.state_dict(),
+                'optimizer_state_dict': optimizer.state_dict(),
+                'state': state,
+                'run': run,
+            }, tmp_path)
+            os.replace(tmp_path, self.checkpoint_path)
+
+        if state['best_state'] is not None:
+            self._model.load_state_dict(state['best_state'])
         self.is_trained = True
         self._model.eval()
         self.save(self.model_path, False)
+        self.checkpoint_path.unlink(missing_ok=True)
+
+    def _train_epoch(self, optimizer, criterion, batches: DataLoader) -> float:
+        self._model.train()
+        total_loss = 0.0
+        for x, y in batches:
+            optimizer.zero_grad()
+            loss = criterion(self._model(x), y)
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item() * len(x)
+        return total_loss / len(batches.dataset)
+
+    def _evaluate_loss(self, criterion, batches: DataLoader) -> float:
+        self._model.eval()
+        total_loss = 0.0
+        with torch.no_grad():
+            for x, y in batches:
+                total_loss += criterion(self._model(x), y).item() * len(x)
+        return total_loss / len(batches.dataset)
 
-    def _train_epoch(self, optimizer, criterion, x, y):
-        optimizer.zero_grad()
-        loss = criterion(self._model(x), y)
-        loss.backward()
-        optimizer.step()
-        return loss
-
-    def predict(self, game_state: GameState) -> np.ndarray:
-        features = self.engineer_features(game_state).reshape(1, -1)
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
         x = torch.tensor(features, dtype=torch.float32)
         with torch.no_grad():
             output = self._model(x)
-        return output.squeeze().numpy()
+        return output.numpy()
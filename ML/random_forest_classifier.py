@@ -1,4 +1,3 @@
-import pickle
 from pathlib import Path
 
 import numpy as np
@@ -7,7 +6,7 @@ from numpy import ndarray
 from ML.base_model import BaseWordleModel
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.multioutput import MultiOutputClassifier
-from Utilities.game_state import GameState
+from Utilities.training_dataset import load_training_dataset
 
 # Labels are continuous letter-frequency values; binarize above this threshold.
 _LABEL_THRESHOLD = 0.35
@@ -26,12 +25,9 @@ class RandomForestClassifierModel(BaseWordleModel):
             self.is_trained = True
             return
 
-        with open('ML/training_data/wordle_training.pkl', 'rb') as f:
-            training_data = pickle.load(f)
+        x, y = load_training_dataset()
 
         print("This bot isn't trained yet! Training...")
-        x = np.array([example[0] for example in training_data])
-        y = np.array([example[1] for example in training_data])
 
         y_binary = (y > _LABEL_THRESHOLD).astype(int)
 
@@ -43,16 +39,15 @@ class RandomForestClassifierModel(BaseWordleModel):
         self.is_trained = True
         self.save(self.model_path, True)
 
-    def predict(self, game_state: GameState) -> ndarray:
-        features = self.engineer_features(game_state).reshape(1, -1)
+    def predict_batch(self, features: ndarray) -> ndarray:
         proba_list = self._model.predict_proba(features)
 
-        letter_probs = np.zeros(26)
+        letter_probs = np.zeros((len(features), 26))
         for i, proba in enumerate(proba_list):
             if proba.shape[1] == 2:
-                letter_probs[i] = proba[0, 1]
+                letter_probs[:, i] = proba[:, 1]
             else:
                 # Only one class seen during training for this letter (effectively absent).
-                letter_probs[i] = 0.0
+                letter_probs[:, i] = 0.0
 
         return letter_probs
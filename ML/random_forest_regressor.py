@@ -1,12 +1,10 @@
-import pickle
 from pathlib import Path
 
-import numpy as np
 from numpy import ndarray
 
 from ML.base_model import BaseWordleModel
 from sklearn.ensemble import RandomForestRegressor
-from Utilities.game_state import GameState
+from Utilities.training_dataset import load_training_dataset
 
 _N_ESTIMATORS = 100
 
@@ -25,11 +23,7 @@ class RandomForestRegressorModel(BaseWordleModel):
             return
 
         print("Training model...")
-        with open('ML/training_data/wordle_training.pkl', 'rb') as f:
-            training_data = pickle.load(f)
-
-        x = np.array([example[0] for example in training_data])
-        y = np.array([example[1] for example in training_data])
+        x, y = load_training_dataset()
 
         # n_jobs > 1 only during fit — reset to 1 before saving to avoid conflicts
         # when this model is later used inside a multiprocessing Pool.
@@ -39,6 +33,5 @@ class RandomForestRegressorModel(BaseWordleModel):
         self.is_trained = True
         self.save(self.model_path, True)
 
-    def predict(self, game_state: GameState) -> ndarray:
-        features = self.engineer_features(game_state).reshape(1, -1)
-        return self._model.predict(features)[0]
+    def predict_batch(self, features: ndarray) -> ndarray:
+        return self._model.predict(features)
@@ -0,0 +1,151 @@
+import numpy as np
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity ring buffer of transitions stored in preallocated, contiguous arrays.
+
+    Once full, each new transition overwrites the oldest. Sampling is one index gather
+    per field, and the gathered arrays are ready for torch.from_numpy().
+    """
+
+    def __init__(self, capacity: int, state_size: int) -> None:
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        self.position = 0
+        self.size = 0
+        self._rng = np.random.default_rng()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, state: np.ndarray, action: int, reward: float, next_state: np.ndarray, done: bool) -> int:
+        """Store one transition. Returns the slot it was written to."""
+        slot = self.position
+        self.states[slot] = state
+        self.actions[slot] = action
+        self.rewards[slot] = reward
+        self.next_states[slot] = next_state
+        self.dones[slot] = done
+        self.position = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return slot
+
+    def _gather(self, indices: np.ndarray) -> tuple:
+        return (self.states[indices], self.actions[indices], self.rewards[indices],
+                self.next_states[indices], self.dones[indices])
+
+    def sample(self, batch_size: int) -> tuple[np.ndarray, tuple, np.ndarray]:
+        """
+        Draw batch_size distinct transitions uniformly.
+
+        Returns:
+            tuple: (indices, (states, actions, rewards, next_states, dones), weights), where
+            weights are the per-sample loss weights (all 1 for uniform sampling).
+        """
+        indices = self._rng.choice(self.size, batch_size, replace=False)
+        return indices, self._gather(indices), np.ones(batch_size, dtype=np.float32)
+
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray) -> None:
+        """Uniform sampling ignores priorities."""
+        pass
+
+
+class SumTree:
+    """
+    Binary tree over `capacity` leaf priorities where every node holds the sum of its children.
+
+    Updating leaves and finding the leaf under a cumulative-priority value are both
+    O(log capacity), and both are vectorized over arrays of leaves or values.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.depth = max(1, int(np.ceil(np.log2(capacity))))
+        self.leaf_offset = 1 << self.depth
+        self.tree = np.zeros(2 * self.leaf_offset)
+
+    @property
+    def total(self) -> float:
+        return self.tree[1]
+
+    def update(self, leaves: np.ndarray, priorities: np.ndarray) -> None:
+        nodes = np.asarray(leaves) + self.leaf_offset
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Leaf index whose cumulative-priority interval contains each value."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            go_right = values > self.tree[left]
+            values -= self.tree[left] * go_right
+            nodes = left + go_right
+        return nodes - self.leaf_offset
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Prioritized experience replay (Schaul et al., 2016) over the same ring buffer.
+
+    Transitions are drawn with probability proportional to priority^alpha, where a
+    transition's priority is its latest |TD error|; new transitions get the highest
+    priority seen so far so each is replayed at least once. Importance-sampling weights,
+    with beta annealed towards 1, correct the bias this introduces into the loss.
+    """
+
+    def __init__(self, capacity: int, state_size: int, alpha: float = 0.6, beta: float = 0.4,
+                 beta_increment: float = 1e-4, epsilon: float = 1e-5) -> None:
+        """
+        Args:
+            capacity: Maximum transitions held.
+            state_size: Length of a state vector.
+            alpha: How strongly priorities skew sampling (0 is uniform).
+            beta: Initial importance-sampling exponent.
+            beta_increment: Added to beta after every sample() call, up to 1.
+            epsilon: Added to |TD error| so no transition's priority reaches zero.
+        """
+        super().__init__(capacity, state_size)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self._tree = SumTree(capacity)
+
+    def add(self, state: np.ndarray, action: int, reward: float, next_state: np.ndarray, done: bool) -> int:
+        slot = super().add(state, action, reward, next_state, done)
+        self._tree.update(np.array([slot]), np.array([self.max_priority ** self.alpha]))
+        return slot
+
+    def sample(self, batch_size: int) -> tuple[np.ndarray, tuple, np.ndarray]:
+        """
+        Draw batch_size transitions, one from each equal slice of the total priority.
+
+        Returns:
+            tuple: (indices, (states, actions, rewards, next_states, dones), weights), with
+            importance-sampling weights normalized so the largest is 1.
+        """
+        total = self._tree.total
+        bounds = np.linspace(0.0, total, batch_size + 1)
+        values = self._rng.uniform(bounds[:-1], bounds[1:])
+        # Rounding can land just past the last stored transition; clamp back into range.
+        indices = np.minimum(self._tree.find(values), self.size - 1)
+
+        probabilities = self._tree.tree[indices + self._tree.leaf_offset] / total
+        weights = (self.size * probabilities) ** -self.beta
+        weights = (weights / weights.max()).astype(np.float32)
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return indices, self._gather(indices), weights
+
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray) -> None:
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self._tree.update(indices, priorities ** self.alpha)
@@ -1,10 +1,14 @@
+import os
 from multiprocessing import Pool
-from random import choice
+from pathlib import Path
+from random import Random
 import pickle
 import numpy as np
 
 from ML.entropy_maximization_bot import EntropyBot
 from ML import entropy_maximization_bot
+from Utilities.pattern_table import build_pattern_table, share_pattern_table, attach_pattern_table
+from Utilities.training_dataset import TRAINING_DATA_PATH, TRAINING_SHARD_DIR, list_training_shards
 from Utilities.shared_utils import (calculate_normalized_letter_freq, score_guess,
                                     get_high_frequency_candidates, filter_words,
                                     extract_features, SACRIFICIAL_THRESHOLD, MAX_GUESSES)
@@ -13,6 +17,10 @@ from Utilities.shared_utils import (calculate_normalized_letter_freq, score_gues
 # many high-frequency candidates to keep label generation tractable.
 _ENTROPY_LABEL_POOL_SIZE = 200
 
+# Streaming collection writes one .npz per fixed number of games; a shard is only
+# renamed into place once complete, so an interrupted run can resume from the last one.
+GAMES_PER_SHARD = 50
+
 worker_pattern_table = None
 
 
@@ -21,6 +29,10 @@ def create_training_labels(bot: entropy_maximization_bot.EntropyBot, k: int) ->
     Compute the normalized letter-frequency vector of the top-k highest-entropy
     words from the current game state. Used as the training label for a given state.
 
+    Every candidate is scored in one calculate_entropies() call and the top k are
+    selected with argpartition; entropies tied with the k-th best are taken in
+    candidate order, as a stable sort would.
+
     Args:
         bot: EntropyBot with the current remaining word list.
         k: Number of top-entropy words to include in the label.
@@ -28,64 +40,130 @@ def create_training_labels(bot: entropy_maximization_bot.EntropyBot, k: int) ->
     Returns:
         np.ndarray: Shape (26,) normalized letter frequencies.
     """
-    if len(bot.game_state.remaining_words) > SACRIFICIAL_THRESHOLD:
-        pool_size = min(_ENTROPY_LABEL_POOL_SIZE, len(bot.game_state.remaining_words) * 2)
+    if bot.game_state.remaining_count > SACRIFICIAL_THRESHOLD:
+        pool_size = min(_ENTROPY_LABEL_POOL_SIZE, bot.game_state.remaining_count * 2)
         candidates = get_high_frequency_candidates(bot.game_state, pool_size)
+        candidate_indices = np.array([bot.game_state.word_to_index[word] for word in candidates])
     else:
-        candidates = bot.game_state.master_list
+        candidate_indices = np.arange(len(bot.game_state.master_list))
 
-    entropy_pairs = [(word, bot.calculate_entropy(word)) for word in candidates]
-    entropy_pairs.sort(key=lambda x: x[1], reverse=True)
-    top_k_words = [word for word, _ in entropy_pairs[:k]]
+    entropies = bot.calculate_entropies(candidate_indices)
+    if len(entropies) > k:
+        kth_entropy = entropies[np.argpartition(-entropies, k - 1)[k - 1]]
+        above = np.flatnonzero(entropies > kth_entropy)
+        tied = np.flatnonzero(entropies == kth_entropy)[:k - len(above)]
+        candidate_indices = candidate_indices[np.concatenate([above, tied])]
 
+    top_k_words = [bot.game_state.master_list[i] for i in candidate_indices]
     return calculate_normalized_letter_freq(top_k_words)
 
 
+def _game_examples(bot: EntropyBot, target_word: str, k: int):
+    """Play one game from the bot's current state, yielding a (features, label) pair before each guess."""
+    guess_count = 0
+    while guess_count < MAX_GUESSES:
+        yield extract_features(bot.game_state), create_training_labels(bot, k)
+        bot_guess = bot.make_guess()
+        if bot_guess == target_word:
+            break
+        score = score_guess(target_word, bot_guess)
+        filter_words(bot_guess, score, bot.game_state, worker_pattern_table)
+        guess_count += 1
+
+
+def _answer_rng(seed: int | None, index: int) -> Random:
+    """
+    Answer picker for one worker or shard. Seeded from the OS when seed is None, so forked
+    workers do not replay each other's answers; otherwise from seed and index, so a seeded
+    run picks the same answers whatever the process count.
+    """
+    return Random() if seed is None else Random(f"{seed}-{index}")
+
+
 def _collect_games_worker(args: tuple) -> list:
     """
     Simulate games with the entropy bot and collect (features, labels) pairs.
 
     Args:
-        args: (num_games, k, word_list)
+        args: (num_games, k, word_list, seed, worker_index)
 
     Returns:
         list of (feature_vector, label_vector) tuples.
     """
-    num_games, k, word_list = args
+    num_games, k, word_list, seed, worker_index = args
+    rng = _answer_rng(seed, worker_index)
     training_data = []
 
     for _ in range(num_games):
         bot = EntropyBot(word_list, worker_pattern_table)
-        target_word = choice(word_list)
-        guess_count = 0
-
-        while guess_count < MAX_GUESSES:
-            training_data.append((
-                extract_features(bot.game_state),
-                create_training_labels(bot, k),
-            ))
-            bot_guess = bot.make_guess()
-            if bot_guess == target_word:
-                break
-            score = score_guess(target_word, bot_guess)
-            filter_words(bot_guess, score, bot.game_state)
-            guess_count += 1
+        training_data.extend(_game_examples(bot, rng.choice(word_list), k))
 
     return training_data
 
 
-def init_worker(pattern_table):
+def _collect_shard_worker(args: tuple) -> str:
+    """
+    Simulate games with the entropy bot and write their examples to one shard.
+
+    The shard holds float32 arrays features (rows, 314) and labels (rows, 26), plus the
+    number of games it covers. It is written under a temporary name and renamed when done.
+
+    Args:
+        args: (shard_path, num_games, k, word_list, seed)
+
+    Returns:
+        str: Path of the finished shard.
+    """
+    shard_path, num_games, k, word_list, seed = args
+    # Keyed by shard number, so a resumed seeded run plays the games the interrupted one would have.
+    rng = _answer_rng(seed, _shard_index(shard_path))
+    bot = EntropyBot(word_list, worker_pattern_table)
+    features, labels = [], []
+
+    for _ in range(num_games):
+        bot.game_state.reset()
+        for feature_vector, label_vector in _game_examples(bot, rng.choice(word_list), k):
+            features.append(feature_vector)
+            labels.append(label_vector)
+
+    tmp_path = shard_path.with_name(shard_path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, features=np.array(features, dtype=np.float32),
+                 labels=np.array(labels, dtype=np.float32), games=num_games)
+    os.replace(tmp_path, shard_path)
+    return str(shard_path)
+
+
+def _shard_index(shard_path: Path) -> int:
+    return int(shard_path.stem.split("_")[1])
+
+
+def shard_game_count(shard_path: Path) -> int:
+    with np.load(shard_path) as shard:
+        return int(shard["games"])
+
+
+def init_worker(pattern_table_handle):
     global worker_pattern_table
-    worker_pattern_table = pattern_table
+    worker_pattern_table = attach_pattern_table(pattern_table_handle)
 
 
 class TrainingDataCollector:
-    def __init__(self, word_list: list[str], pattern_table: np.ndarray):
+    def __init__(self, word_list: list[str], pattern_table: np.ndarray = None, processes: int = 1):
+        """
+        Args:
+            word_list: Vocabulary shared by the simulated games.
+            pattern_table: Precomputed pattern table for word_list. Built here when omitted.
+            processes: Worker process count used to build a missing pattern table.
+        """
         self.word_list = word_list
         self.training_data = []
+        if pattern_table is None:
+            pattern_table = build_pattern_table(word_list, processes)
         self.entropy_pattern_table = pattern_table
 
-    def collect_training_data_parallel(self, num_games: int, k: int = 10, processes: int = 4):
+    def collect_training_data_parallel(self, num_games: int, k: int = 10, processes: int = 4,
+                                       output: Path = TRAINING_DATA_PATH, seed: int = None):
         """
         Simulate games across multiple processes and aggregate training data.
 
@@ -93,16 +171,68 @@ class TrainingDataCollector:
             num_games: Total number of games to simulate.
             k: Number of top-entropy words used to construct each label.
             processes: Worker process count.
+            output: Pickle file the examples are written to.
+            seed: Seed for the answers each worker picks; None for a different set every run.
         """
         games_per_process = num_games // processes
-        args = [(games_per_process, k, self.word_list) for _ in range(processes)]
+        args = [(games_per_process, k, self.word_list, seed, worker_index) for worker_index in range(processes)]
 
-        with Pool(processes=processes, initializer=init_worker,
-                  initargs=(self.entropy_pattern_table,)) as pool:
+        with share_pattern_table(self.entropy_pattern_table) as pattern_table_handle, \
+                Pool(processes=processes, initializer=init_worker, initargs=(pattern_table_handle,)) as pool:
             results = pool.map(_collect_games_worker, args)
 
         for process_data in results:
             self.training_data.extend(process_data)
 
-        with open('ML/training_data/wordle_training.pkl', 'wb') as f:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'wb') as f:
             pickle.dump(self.training_data, f)
+
+    def collect_training_data_streaming(self, num_games: int, k: int = 10, processes: int = 4,
+                                        shard_dir: Path = TRAINING_SHARD_DIR,
+                                        games_per_shard: int = GAMES_PER_SHARD,
+                                        resume: bool = False, seed: int = None) -> list[Path]:
+        """
+        Simulate games across multiple processes, streaming examples to shard files.
+
+        Workers each write finished shards of games_per_shard games and hand back only
+        the shard path, so memory use does not grow with num_games and a crash loses at
+        most the shards in progress. New shards are numbered after the existing ones.
+
+        Args:
+            num_games: Games to simulate.
+            k: Number of top-entropy words used to construct each label.
+            processes: Worker process count.
+            shard_dir: Directory holding the shards.
+            games_per_shard: Games per shard file.
+            resume: Treat num_games as the total wanted in shard_dir and only play the
+                games the existing shards are missing. Otherwise num_games more are appended.
+            seed: Seed for the answers picked in each shard, combined with the shard's
+                number; None for a different set every run.
+
+        Returns:
+            list[Path]: Every finished shard in shard_dir, old and new.
+        """
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        for partial_shard in shard_dir.glob("*.tmp"):
+            partial_shard.unlink()
+
+        existing_shards = list_training_shards(shard_dir)
+        if resume:
+            collected_games = sum(shard_game_count(path) for path in existing_shards)
+            print(f"{collected_games} games already collected in {len(existing_shards)} shards")
+            num_games = max(0, num_games - collected_games)
+
+        next_index = _shard_index(existing_shards[-1]) + 1 if existing_shards else 0
+        args = []
+        for offset, start in enumerate(range(0, num_games, games_per_shard)):
+            shard_path = shard_dir / f"shard_{next_index + offset:06d}.npz"
+            args.append((shard_path, min(games_per_shard, num_games - start), k, self.word_list, seed))
+
+        if args:
+            with share_pattern_table(self.entropy_pattern_table) as pattern_table_handle, \
+                    Pool(processes=processes, initializer=init_worker, initargs=(pattern_table_handle,)) as pool:
+                for done, shard_path in enumerate(pool.imap_unordered(_collect_shard_worker, args), start=1):
+                    print(f"Wrote {shard_path} ({done}/{len(args)})")
+
+        return list_training_shards(shard_dir)
@@ -54,3 +54,21 @@ def print_game_start():
 
 def print_end_screen(correct_word: str, guess_count: int):
     print(f"You guessed the word, {correct_word}, in {guess_count} guesses!")
+
+
+def print_histogram(histogram: dict[str, int], total: int):
+    """
+    Print a guess-count histogram as horizontal bars.
+
+    Args:
+        histogram: Games per outcome label (e.g. "1".."6", "failed").
+        total: Total number of games, used for percentages.
+    """
+    print("\nGuess Distribution:")
+    print("-" * 30)
+    largest = max(histogram.values(), default=0) or 1
+    for label, count in histogram.items():
+        bar = "#" * round(count / largest * 40)
+        share = count / total * 100 if total else 0.0
+        print(f"{label:>6} | {bar} {count} ({share:.1f}%)")
+    print("-" * 30)
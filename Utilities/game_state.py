@@ -1,21 +1,122 @@
+import numpy as np
+
+from Utilities.word_encoding import letter_incidence
+
+# Green (5×26) and yellow (5×26) position planes followed by the gray letter flags (26).
+CONSTRAINT_FEATURE_SIZE = 5 * 26 * 2 + 26
+
+
 class GameState:
-    def __init__(self, word_list: list[str]) -> None:
-        self.remaining_words_indices = list(range(len(word_list)))
-        self.remaining_words = word_list
-        self.guess_count = 0
-        self.master_list = word_list
-        self.gray_letters = set()
-        self.green_letters = {}
-        self.yellow_letters = set()
-        self.scored_rounds = dict()
-        self.word_to_index = {word: i for i, word in enumerate(word_list)}
+    """
+    Per-game solver state.
+
+    The remaining answers are stored as remaining_mask, a boolean mask over master_list.
+    remaining_words and remaining_words_indices are derived from it lazily and cached
+    until the mask changes, so existing list-based callers keep working.
+
+    The inputs to extract_features() are kept here too: the remaining words' letter
+    frequencies are cached per mask, and the green/yellow/gray constraint planes are
+    updated by record_round() from each new guess alone.
+    """
 
+    def __init__(self, word_list: list[str], word_to_index: dict[str, int] = None) -> None:
+        """
+        Args:
+            word_list: Vocabulary the game is played over (master_list).
+            word_to_index: word_list's word -> index map, shared from another GameState over
+                the same list to skip rebuilding it; built here when omitted.
+        """
+        self.master_list = word_list
+        self.word_to_index = word_to_index if word_to_index is not None else {
+            word: i for i, word in enumerate(word_list)}
+        self.reset()
 
     def reset(self) -> None:
-        self.remaining_words_indices = list(range(len(self.master_list)))
-        self.remaining_words = self.master_list
+        self.remaining_mask = np.ones(len(self.master_list), dtype=bool)
+        self._remaining_words = self.master_list
         self.guess_count = 0
         self.gray_letters = set()
         self.green_letters = {}
         self.yellow_letters = set()
         self.scored_rounds = dict()
+        self.constraint_features = np.zeros(CONSTRAINT_FEATURE_SIZE)
+
+    @property
+    def remaining_mask(self) -> np.ndarray:
+        """Boolean mask over master_list; True for words that are still possible answers."""
+        return self._remaining_mask
+
+    @remaining_mask.setter
+    def remaining_mask(self, mask: np.ndarray) -> None:
+        self._remaining_mask = mask
+        self._remaining_words = None
+        self._remaining_indices = None
+        self._letter_counts = None
+        self._letter_frequencies = None
+
+    @property
+    def remaining_words_indices(self) -> np.ndarray:
+        """master_list indices of the remaining words, in ascending order."""
+        if self._remaining_indices is None:
+            self._remaining_indices = np.flatnonzero(self._remaining_mask)
+        return self._remaining_indices
+
+    @property
+    def remaining_words(self) -> list[str]:
+        """Remaining words in master_list order, materialized from the mask on demand."""
+        if self._remaining_words is None:
+            self._remaining_words = [self.master_list[i] for i in self.remaining_words_indices]
+        return self._remaining_words
+
+    @property
+    def remaining_count(self) -> int:
+        return len(self.remaining_words_indices)
+
+    @property
+    def letter_incidence(self) -> np.ndarray:
+        """(N, 26) float32 0/1 matrix of which letters each master_list word contains, shared per vocabulary."""
+        return letter_incidence(self.master_list)
+
+    @property
+    def letter_counts(self) -> np.ndarray:
+        """
+        (26,) float32 number of remaining words containing each letter (index 0 = 'a').
+
+        Counted with one product of the remaining mask and the vocabulary's letter
+        incidence matrix, and cached until the mask changes.
+        """
+        if self._letter_counts is None:
+            self._letter_counts = self._remaining_mask @ self.letter_incidence
+        return self._letter_counts
+
+    @property
+    def letter_frequencies(self) -> np.ndarray:
+        """(26,) fraction of remaining words containing each letter, derived from letter_counts."""
+        if self._letter_frequencies is None:
+            remaining_count = self.remaining_count
+            if remaining_count == 0:
+                self._letter_frequencies = np.zeros(26)
+            else:
+                self._letter_frequencies = self.letter_counts.astype(np.float64) / remaining_count
+        return self._letter_frequencies
+
+    def record_round(self, guess: str, result: list[int]) -> None:
+        """Store a guess's feedback and set its green, yellow and gray flags in constraint_features."""
+        self.scored_rounds[guess] = result
+        green_letters = self.constraint_features[:130].reshape(5, 26)
+        yellow_letters = self.constraint_features[130:260].reshape(5, 26)
+        gray_letters = self.constraint_features[260:]
+        for pos, (letter, score) in enumerate(zip(guess, result)):
+            letter_idx = ord(letter) - ord('a')
+            if score == 2:
+                green_letters[pos, letter_idx] = 1
+            elif score == 1:
+                yellow_letters[pos, letter_idx] = 1
+            else:
+                gray_letters[letter_idx] = 1
+
+    def keep_remaining(self, keep: np.ndarray) -> None:
+        """Keep the remaining words where keep, aligned with remaining_words_indices, is True."""
+        mask = np.zeros(len(self.master_list), dtype=bool)
+        mask[self.remaining_words_indices[keep]] = True
+        self.remaining_mask = mask
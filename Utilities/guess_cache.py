@@ -0,0 +1,115 @@
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from Utilities.game_state import GameState
+from Utilities.pattern_table import word_list_hash
+from Utilities.shared_utils import filter_words, score_guess
+
+# Bump whenever EntropyBot's guess selection changes so stale decisions are discarded.
+GUESS_CACHE_VERSION = 2
+GUESS_CACHE_PATH = Path("ML/saved_models/entropy_guess_cache.pkl")
+GUESS_CACHE_MAX_ENTRIES = 4096
+# Turns precomputed by warm(): the opening guess, then the reply to each of its feedback patterns.
+GUESS_CACHE_WARM_DEPTH = 2
+
+
+class GuessCache:
+    """
+    Bounded LRU memo of EntropyBot decisions.
+
+    The entropy bot's choice is fully determined by the word list and the guess/feedback
+    history of the game, so that history is the key and the chosen guess the value.
+    Copies handed to Pool workers are private: workers may add entries, but only the
+    parent process saves the cache.
+    """
+
+    def __init__(self, word_list: list[str], max_entries: int = GUESS_CACHE_MAX_ENTRIES) -> None:
+        self.word_list_hash = word_list_hash(word_list)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def history_key(game_state: GameState) -> tuple:
+        """Key for the game so far: ((guess, per-letter scores), ...) in play order."""
+        return tuple((guess, tuple(score)) for guess, score in game_state.scored_rounds.items())
+
+    def get(self, key: tuple) -> str | None:
+        guess = self._entries.get(key)
+        if guess is not None:
+            self._entries.move_to_end(key)
+        return guess
+
+    def put(self, key: tuple, guess: str) -> None:
+        self._entries[key] = guess
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def warm(self, bot, depth: int = GUESS_CACHE_WARM_DEPTH) -> None:
+        """
+        Fill the cache with the bot's decision for every reachable history up to `depth` guesses.
+
+        Each history is replayed from a reset game state, and one representative answer
+        per feedback pattern is enough to expand it, since the pattern alone decides what
+        remains.
+
+        Args:
+            bot: EntropyBot using this cache.
+            depth: Number of turns to precompute.
+        """
+        frontier = [[]]
+        for _ in range(depth):
+            next_frontier = []
+            for history in frontier:
+                bot.game_state.reset()
+                for guess, score in history:
+                    bot.game_state.guess_count += 1
+                    filter_words(guess, score, bot.game_state, bot.pattern_table)
+
+                guess = bot.make_guess()
+                remaining_indices = np.asarray(bot.game_state.remaining_words_indices)
+                if len(remaining_indices) <= 1:
+                    continue
+
+                guess_idx = bot.game_state.word_to_index[guess]
+                patterns = bot.pattern_table[guess_idx, remaining_indices]
+                _, first_seen = np.unique(patterns, return_index=True)
+                for answer_idx in remaining_indices[first_seen]:
+                    answer = bot.game_state.master_list[answer_idx]
+                    if answer != guess:
+                        next_frontier.append(history + [(guess, score_guess(answer, guess))])
+            frontier = next_frontier
+        bot.game_state.reset()
+
+    def save(self, path: Path = GUESS_CACHE_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump({
+                'version': GUESS_CACHE_VERSION,
+                'word_list_hash': self.word_list_hash,
+                'entries': list(self._entries.items()),
+            }, f)
+
+    @staticmethod
+    def load(word_list: list[str], path: Path = GUESS_CACHE_PATH,
+             max_entries: int = GUESS_CACHE_MAX_ENTRIES) -> 'GuessCache':
+        """
+        Load the saved cache for word_list. Returns an empty cache when the file is
+        missing or was written for a different word list or cache version.
+        """
+        cache = GuessCache(word_list, max_entries)
+        if not path.exists():
+            return cache
+
+        with open(path, 'rb') as f:
+            saved = pickle.load(f)
+        if saved.get('version') == GUESS_CACHE_VERSION and saved.get('word_list_hash') == cache.word_list_hash:
+            for key, guess in saved['entries']:
+                cache.put(key, guess)
+        return cache
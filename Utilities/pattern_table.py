@@ -0,0 +1,277 @@
+import hashlib
+import json
+import mmap
+import os
+from contextlib import contextmanager
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import numpy as np
+
+from Utilities.shared_utils import (encode_words, _pattern_codes, calculate_entropy_pattern_table,
+                                    PATTERN_BLOCK_SIZE)
+
+# Bump whenever the pattern encoding changes so stale tables on disk are rebuilt.
+PATTERN_TABLE_VERSION = 1
+PATTERN_TABLE_PATH = Path("ML/saved_models/pattern_table.npy")
+
+# Capacity multiplier when a GrowablePatternTable runs out of room. Any factor > 1 keeps
+# appends amortized O(N); doubling would quadruple an N×N buffer, so growth is gentler.
+PATTERN_TABLE_GROWTH_FACTOR = 1.25
+
+# SharedMemory handles opened by attach_pattern_table(); kept alive for the life of the worker.
+_attached_segments = []
+
+# Set by _init_builder in each worker; rows are written straight into the shared buffer.
+worker_shared_memory = None
+worker_table = None
+worker_encoded_words = None
+
+
+def _init_builder(shared_memory_name: str, n: int, encoded_words: np.ndarray) -> None:
+    global worker_shared_memory, worker_table, worker_encoded_words
+    worker_shared_memory = SharedMemory(name=shared_memory_name)
+    worker_table = np.ndarray((n, n), dtype=np.uint8, buffer=worker_shared_memory.buf)
+    worker_encoded_words = encoded_words
+
+
+def _build_rows(bounds: tuple[int, int]) -> int:
+    """Fill rows [start, stop) of the shared table. Returns the row count so nothing large is pickled back."""
+    start, stop = bounds
+    worker_table[start:stop] = _pattern_codes(worker_encoded_words[start:stop], worker_encoded_words)
+    return stop - start
+
+
+def build_pattern_table(word_list: list[str], processes: int = 1,
+                        block_size: int = PATTERN_BLOCK_SIZE) -> np.ndarray:
+    """
+    Build the N×N pattern table, splitting guess-row blocks across worker processes.
+
+    Workers attach to one shared-memory output buffer and write their rows in place,
+    so only (start, stop) bounds cross the process boundary.
+
+    Args:
+        word_list: Vocabulary; row i / column j of the result correspond to word_list[i] / word_list[j].
+        processes: Worker process count. 1 builds in the current process.
+        block_size: Guess rows per task.
+
+    Returns:
+        np.ndarray: (N, N) uint8 table identical to calculate_entropy_pattern_table().
+    """
+    if processes <= 1:
+        return calculate_entropy_pattern_table(word_list, block_size)
+
+    n = len(word_list)
+    encoded_words = encode_words(word_list)
+    blocks = [(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+
+    print(f"Precomputing {n}x{n} pattern table across {processes} processes...")
+    shared_memory = SharedMemory(create=True, size=max(n * n, 1))
+    try:
+        with Pool(processes, initializer=_init_builder,
+                  initargs=(shared_memory.name, n, encoded_words)) as pool:
+            for _ in pool.imap_unordered(_build_rows, blocks):
+                pass
+        shared_table = np.ndarray((n, n), dtype=np.uint8, buffer=shared_memory.buf)
+        pattern_table = shared_table.copy()
+        del shared_table  # release the export so the segment can be closed
+        return pattern_table
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+
+def word_list_hash(word_list: list[str]) -> str:
+    """Return a stable SHA-256 digest identifying the word list and its order."""
+    return hashlib.sha256("\n".join(word_list).encode("utf-8")).hexdigest()
+
+
+def _header_path(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+def load_pattern_table(word_list: list[str], path: Path = PATTERN_TABLE_PATH,
+                       allow_prefix: bool = False) -> np.ndarray | None:
+    """
+    Open a saved pattern table as a read-only memory map.
+
+    The JSON header next to the .npy file must match the current format version,
+    the word list hash and its length; otherwise the table is treated as missing.
+
+    Args:
+        word_list: Current vocabulary.
+        path: Location of the .npy file.
+        allow_prefix: Also accept a table saved for a leading prefix of word_list, as
+            left behind when words were appended; extend it with GrowablePatternTable.
+
+    Returns:
+        np.ndarray | None: (n, n) uint8 memmap covering word_list[:n], or None when absent or stale.
+    """
+    header_path = _header_path(path)
+    if not path.exists() or not header_path.exists():
+        return None
+
+    with open(header_path, "r", encoding="utf-8") as f:
+        header = json.load(f)
+
+    n = header.get("shape", [0])[0]
+    if n > len(word_list) or (n < len(word_list) and not allow_prefix):
+        return None
+    if (header.get("version") != PATTERN_TABLE_VERSION
+            or header.get("word_list_hash") != word_list_hash(word_list[:n])
+            or header.get("shape") != [n, n]):
+        return None
+
+    pattern_table = np.load(path, mmap_mode="r")
+    if pattern_table.shape != (n, n) or pattern_table.dtype != np.uint8:
+        return None
+    return pattern_table
+
+
+def save_pattern_table(pattern_table: np.ndarray, word_list: list[str],
+                       path: Path = PATTERN_TABLE_PATH) -> np.ndarray:
+    """
+    Write the table as a raw .npy file plus its JSON header, then reopen it memory-mapped.
+
+    The header is removed first and written last, so an interrupted save leaves
+    a table that load_pattern_table() rejects rather than one it trusts.
+
+    Returns:
+        np.ndarray: Read-only memmap of the saved table.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header_path = _header_path(path)
+    header_path.unlink(missing_ok=True)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(pattern_table, dtype=np.uint8))
+    os.replace(tmp_path, path)
+
+    with open(header_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": PATTERN_TABLE_VERSION,
+            "word_list_hash": word_list_hash(word_list),
+            "shape": list(pattern_table.shape),
+        }, f)
+
+    return np.load(path, mmap_mode="r")
+
+
+@contextmanager
+def share_pattern_table(pattern_table: np.ndarray):
+    """
+    Expose the table to Pool workers without pickling its contents.
+
+    A table memory-mapped from a .npy file is shared by path, so every worker maps the
+    same page-cache pages. Anything else is copied once into a SharedMemory segment
+    that lives for the duration of the with-block.
+
+    Yields:
+        tuple | None: Small picklable handle for attach_pattern_table(); None when pattern_table is None.
+    """
+    if pattern_table is None:
+        yield None
+        return
+
+    # Only a whole-file memmap maps directly onto its backing mmap; slices of one
+    # report the parent's filename and offset, so they go through shared memory.
+    if isinstance(pattern_table, np.memmap) and isinstance(pattern_table.base, mmap.mmap):
+        yield "file", pattern_table.filename, pattern_table.offset, pattern_table.shape
+        return
+
+    shared_memory = SharedMemory(create=True, size=max(pattern_table.nbytes, 1))
+    try:
+        shared_table = np.ndarray(pattern_table.shape, dtype=np.uint8, buffer=shared_memory.buf)
+        shared_table[:] = pattern_table
+        del shared_table
+        yield "shm", shared_memory.name, 0, pattern_table.shape
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+
+def attach_pattern_table(handle: tuple) -> np.ndarray | None:
+    """
+    Open a read-only view of a table published with share_pattern_table().
+
+    The returned array keeps its SharedMemory segment referenced, so it stays valid
+    for as long as the worker holds the array.
+    """
+    if handle is None:
+        return None
+
+    kind, name, offset, shape = handle
+    if kind == "file":
+        return np.memmap(name, dtype=np.uint8, mode="r", offset=offset, shape=shape)
+
+    shared_memory = SharedMemory(name=name)
+    pattern_table = np.ndarray(shape, dtype=np.uint8, buffer=shared_memory.buf)
+    pattern_table.flags.writeable = False
+    _attached_segments.append(shared_memory)
+    return pattern_table
+
+
+class GrowablePatternTable:
+    """
+    Pattern table that accepts appended words without a full rebuild.
+
+    The table occupies the top-left corner of an over-allocated square buffer. Appending
+    k words scores only the k new rows and k new columns (2kN + k² cells), and the buffer
+    is reallocated geometrically, so repeated single-word additions stay amortized O(N).
+    """
+
+    def __init__(self, pattern_table: np.ndarray, word_list: list[str]) -> None:
+        """
+        Args:
+            pattern_table: (n, n) table for word_list[:n].
+            word_list: Vocabulary whose leading n words index pattern_table.
+        """
+        self.word_count = len(pattern_table)
+        self._encoded_words = encode_words(word_list[:self.word_count])
+        capacity = max(self.word_count, int(self.word_count * PATTERN_TABLE_GROWTH_FACTOR))
+        self._buffer = np.empty((capacity, capacity), dtype=np.uint8)
+        self._buffer[:self.word_count, :self.word_count] = pattern_table
+
+    @property
+    def table(self) -> np.ndarray:
+        """(word_count, word_count) view of the current table."""
+        return self._buffer[:self.word_count, :self.word_count]
+
+    def _reserve(self, word_count: int) -> None:
+        capacity = len(self._buffer)
+        if word_count <= capacity:
+            return
+        capacity = max(word_count, int(capacity * PATTERN_TABLE_GROWTH_FACTOR))
+        buffer = np.empty((capacity, capacity), dtype=np.uint8)
+        buffer[:self.word_count, :self.word_count] = self.table
+        self._buffer = buffer
+
+    def extend(self, word_list: list[str]) -> np.ndarray:
+        """
+        Add the words of word_list beyond word_count to the table.
+
+        word_list must start with the words the table already covers; words are only
+        ever appended to the vocabulary, never reordered.
+
+        Returns:
+            np.ndarray: View of the extended table.
+        """
+        new_words = word_list[self.word_count:]
+        if not new_words:
+            return self.table
+
+        old_count = self.word_count
+        word_count = old_count + len(new_words)
+        new_encoded = encode_words(new_words)
+        encoded_words = np.concatenate([self._encoded_words, new_encoded])
+
+        self._reserve(word_count)
+        # New guesses against every answer, then existing guesses against the new answers.
+        self._buffer[old_count:word_count, :word_count] = _pattern_codes(new_encoded, encoded_words)
+        self._buffer[:old_count, old_count:word_count] = _pattern_codes(self._encoded_words, new_encoded)
+
+        self._encoded_words = encoded_words
+        self.word_count = word_count
+        return self.table
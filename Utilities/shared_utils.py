@@ -1,5 +1,6 @@
-from collections import Counter, defaultdict
+from collections import Counter
 from Utilities.game_state import GameState
+from Utilities.word_encoding import encode_words, alphabetical_rank
 import numpy as np
 
 # Feature vector length produced by extract_features()
@@ -12,6 +13,13 @@ SACRIFICIAL_THRESHOLD = 20   # Below this many remaining words, allow sacrificia
 HIGH_FREQ_TOP_N = 300        # Candidate pool size when remaining words exceeds SACRIFICIAL_THRESHOLD
 ANSWER_BONUS = 0.01          # Score tiebreaker for words that are still valid answers
 
+# Guess rows scored per vectorized block when building the pattern table; bounds the
+# (block, N) temporaries to a few MB each for the full vocabulary.
+PATTERN_BLOCK_SIZE = 128
+
+# Each score is a 5-digit base-3 number; these are the place values (3^4 … 3^0).
+_PATTERN_PLACE_VALUES = np.array([81, 27, 9, 3, 1], dtype=np.uint8)
+
 
 def calculate_normalized_letter_freq(remaining_words: list[str]) -> np.ndarray:
     """
@@ -58,64 +66,87 @@ def score_guess(correct_word: str, guess: str) -> list[int]:
     return result
 
 
-def filter_words(guess: str, result: list[int], game_state: GameState) -> None:
+def encode_pattern(result: list[int]) -> int:
+    """Convert per-letter scores to the base-3 code stored in the pattern table."""
+    code = 0
+    for score in result:
+        code = code * 3 + score
+    return code
+
+
+def filter_words(guess: str, result: list[int], game_state: GameState,
+                 pattern_table: np.ndarray = None) -> None:
     """
-    Narrow game_state.remaining_words based on the scored guess.
+    Narrow game_state.remaining_words to the words that would have produced `result`.
+
+    With a pattern table for game_state.master_list this is one vectorized comparison
+    against the guess's table row; otherwise the remaining words are scored in one
+    batch with score_guess_batch(). Both keep exactly the words consistent with the feedback.
 
-    Gray with duplicates is handled carefully: if a letter appears green/yellow
-    elsewhere in the same guess, gray means "no additional copies", not "absent".
+    Gray with duplicates is handled carefully in the letter bookkeeping: if a letter
+    appears green/yellow elsewhere in the same guess, gray means "no additional copies",
+    not "absent", so it is not recorded as a gray letter.
 
     Args:
         guess: The guessed word.
         result: Per-letter scores from score_guess().
-        game_state: Mutated in place — remaining_words and indices are updated.
+        game_state: Mutated in place — the remaining-word mask is narrowed and the
+            green/yellow/gray bookkeeping used by extract_features() is updated.
+        pattern_table: Optional precomputed pattern table covering master_list.
     """
-    letter_min_count = defaultdict(int)
-    letter_max_count = {}
-    position_exclusions = defaultdict(set)
-    game_state.scored_rounds[guess] = result
+    game_state.record_round(guess, result)
 
     for pos, (letter, score) in enumerate(zip(guess, result)):
         if score == 2:
-            letter_min_count[letter] += 1
             game_state.green_letters[pos] = letter
         elif score == 1:
-            letter_min_count[letter] += 1
-            position_exclusions[pos].add(letter)
             game_state.yellow_letters.add(letter)
-        else:
-            # Count green+yellow appearances of this letter in the same guess to
-            # determine whether it's fully absent (max=0) or capped at that count.
-            green_yellow_count = sum(1 for l, s in zip(guess, result) if l == letter and s in [1, 2])
-            letter_max_count[letter] = green_yellow_count
-            if green_yellow_count == 0:
-                game_state.gray_letters.add(letter)
-
-    filtered_words = []
-    for word in game_state.remaining_words:
-        if not all(word[pos] == letter for pos, letter in game_state.green_letters.items()):
-            continue
-        if any(word[pos] in excluded for pos, excluded in position_exclusions.items()):
-            continue
-
-        valid = True
-        for letter, min_count in letter_min_count.items():
-            if word.count(letter) < min_count:
-                valid = False
-                break
-        if not valid:
-            continue
-
-        for letter, max_count in letter_max_count.items():
-            if word.count(letter) > max_count:
-                valid = False
-                break
-
-        if valid:
-            filtered_words.append(word)
-
-    game_state.remaining_words = filtered_words
-    game_state.remaining_words_indices = [game_state.word_to_index[word] for word in filtered_words]
+        elif not any(l == letter and s in [1, 2] for l, s in zip(guess, result)):
+            game_state.gray_letters.add(letter)
+
+    observed_pattern = encode_pattern(result)
+    guess_idx = game_state.word_to_index.get(guess)
+    if pattern_table is not None and guess_idx is not None and len(pattern_table) == len(game_state.master_list):
+        patterns = pattern_table[guess_idx, game_state.remaining_words_indices]
+    else:
+        patterns, _ = score_guess_batch(game_state.remaining_words, guess)
+    game_state.keep_remaining(patterns == observed_pattern)
+
+
+def play_lockstep(bot, answers: list[str], pattern_table: np.ndarray = None) -> list[int]:
+    """
+    Play one game per answer with a single bot, advancing every unfinished game together.
+
+    Each turn, one bot.make_guesses() call guesses for all live games, so models score the
+    whole batch with a single predict/forward pass. Solved games drop out of the batch.
+
+    Args:
+        bot: Model with make_guesses(game_states) and a game_state over the vocabulary.
+        answers: Answer word of each game.
+        pattern_table: Optional pattern table passed through to filter_words().
+
+    Returns:
+        list[int]: Per answer, the number of wrong guesses before it was solved; MAX_GUESSES if unsolved.
+    """
+    # Every game shares the bot's word index; building one per game would dominate short games.
+    game_states = [GameState(bot.game_state.master_list, bot.game_state.word_to_index) for _ in answers]
+    results = [MAX_GUESSES] * len(answers)
+
+    live = list(range(len(answers)))
+    for guess_count in range(MAX_GUESSES):
+        if not live:
+            break
+        guesses = bot.make_guesses([game_states[i] for i in live])
+
+        still_live = []
+        for i, guess in zip(live, guesses):
+            if guess == answers[i]:
+                results[i] = guess_count
+            else:
+                filter_words(guess, score_guess(answers[i], guess), game_states[i], pattern_table)
+                still_live.append(i)
+        live = still_live
+    return results
 
 
 def get_high_frequency_candidates(game_state: GameState, top_n: int = HIGH_FREQ_TOP_N,
@@ -129,19 +160,29 @@ def get_high_frequency_candidates(game_state: GameState, top_n: int = HIGH_FREQ_
     Args:
         game_state: Current game state (remaining_words drives frequency counts).
         top_n: Maximum number of candidates to return.
-        candidate_pool: Words to rank. Defaults to game_state.remaining_words.
+        candidate_pool: Words from master_list to rank. Defaults to game_state.remaining_words.
     """
     if candidate_pool is None:
-        candidate_pool = game_state.remaining_words
-
-    letter_freq = Counter()
-    for word in game_state.remaining_words:
-        for letter in set(word):
-            letter_freq[letter] += 1
-
-    scored_candidates = [(sum(letter_freq[l] for l in set(word)), word) for word in candidate_pool]
-    scored_candidates.sort(reverse=True)
-    return [word for _, word in scored_candidates[:top_n]]
+        pool_indices = game_state.remaining_words_indices
+    elif candidate_pool is game_state.master_list:
+        pool_indices = np.arange(len(candidate_pool))
+    else:
+        pool_indices = np.array([game_state.word_to_index[word] for word in candidate_pool], dtype=np.int64)
+    if len(pool_indices) == 0:
+        return []
+
+    # Each word scores the number of remaining words sharing each of its distinct letters.
+    scores = (game_state.letter_incidence @ game_state.letter_counts)[pool_indices]
+    if len(scores) > top_n:
+        # Only words scoring at least the top_n-th best can place; sort just those.
+        kth_score = scores[np.argpartition(-scores, top_n - 1)[top_n - 1]]
+        contenders = np.flatnonzero(scores >= kth_score)
+        pool_indices, scores = pool_indices[contenders], scores[contenders]
+    ranks = alphabetical_rank(game_state.master_list)[pool_indices]
+
+    # Highest score first, ties by word in reverse alphabetical order.
+    order = np.lexsort((ranks, scores))[::-1][:top_n]
+    return [game_state.master_list[i] for i in pool_indices[order]]
 
 
 def extract_features(game_state: GameState) -> np.ndarray:
@@ -155,47 +196,98 @@ def extract_features(game_state: GameState) -> np.ndarray:
         [286:312] gray letter flags, shape (26,)
         [312]     fraction of words still remaining
         [313]     current guess count
-    """
-    letter_frequencies = calculate_normalized_letter_freq(game_state.remaining_words)
-    green_letters = np.zeros((5, 26), dtype=int)
-    yellow_letters = np.zeros((5, 26), dtype=int)
-    gray_letters = np.zeros(26, dtype=int)
-
-    for guess, score in game_state.scored_rounds.items():
-        for pos, (letter, result) in enumerate(zip(guess, score)):
-            letter_idx = ord(letter) - ord('a')
-            if result == 2:
-                green_letters[pos, letter_idx] = 1
-            elif result == 1:
-                yellow_letters[pos, letter_idx] = 1
-            else:
-                gray_letters[letter_idx] = 1
 
+    Assembled from the pieces GameState keeps up to date, so no pass over the
+    remaining words or the earlier guesses is needed. Returns a new array each call.
+    """
     return np.concatenate([
-        letter_frequencies,
-        green_letters.flatten(),
-        yellow_letters.flatten(),
-        gray_letters,
-        [len(game_state.remaining_words) / len(game_state.master_list)],
+        game_state.letter_frequencies,
+        game_state.constraint_features,
+        [game_state.remaining_count / len(game_state.master_list)],
         [game_state.guess_count],
     ])
 
 
-def calculate_entropy_pattern_table(word_list: list[str]) -> np.ndarray:
+def _score_positions(guesses: np.ndarray, answers: np.ndarray) -> list[np.ndarray]:
+    """
+    Vectorized score_guess() over broadcastable (..., 5) arrays from encode_words().
+
+    Duplicate letters follow the same rule as score_guess(): a non-green guess letter
+    is yellow only while the answer still has unmatched copies of it, and copies are
+    consumed left to right. That makes position i yellow exactly when the number of
+    earlier non-green copies in the guess is below the answer's unmatched count.
+
+    Returns:
+        list[np.ndarray]: One uint8 score array per letter position — 2 green, 1 yellow, 0 gray.
+    """
+    guess_letters = [guesses[..., i] for i in range(5)]
+    answer_letters = [answers[..., i] for i in range(5)]
+    not_green = [g != a for g, a in zip(guess_letters, answer_letters)]
+
+    scores = []
+    for i, letter in enumerate(guess_letters):
+        available = sum(((letter == answer_letters[k]) & not_green[k]).astype(np.uint8) for k in range(5))
+        consumed = sum(((letter == guess_letters[j]) & not_green[j]).astype(np.uint8) for j in range(i))
+        yellow = not_green[i] & (consumed < available)
+        scores.append(np.where(not_green[i], yellow, 2).astype(np.uint8))
+    return scores
+
+
+def score_guess_batch(answers: list[str] | np.ndarray,
+                      guesses: str | list[str] | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized score_guess() for many (answer, guess) pairs.
+
+    guesses is either a single word, scored against every answer, or a sequence of the
+    same length as answers, scored pairwise. Words may be strings or rows from encode_words().
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (codes, scores) — (M,) uint8 base-3 pattern codes as
+        produced by encode_pattern(), and (M, 5) uint8 per-letter scores (.tolist() gives
+        the score_guess() lists).
+    """
+    answers = encode_words(answers) if not isinstance(answers, np.ndarray) else answers
+    if isinstance(guesses, str):
+        guesses = encode_words([guesses])[0]
+    elif not isinstance(guesses, np.ndarray):
+        guesses = encode_words(guesses)
+
+    scores = np.stack(_score_positions(guesses, answers), axis=-1)
+    codes = (scores * _PATTERN_PLACE_VALUES).sum(axis=-1, dtype=np.uint8)
+    return codes, scores
+
+
+def _pattern_codes(guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """
+    Score every encoded guess against every encoded answer.
+
+    Returns:
+        np.ndarray: (len(guesses), len(answers)) uint8 base-3 pattern codes in [0, 242].
+    """
+    scores = _score_positions(guesses[:, None, :], answers[None, :, :])
+    codes = np.zeros(scores[0].shape, dtype=np.uint8)
+    for place_value, position_scores in zip(_PATTERN_PLACE_VALUES, scores):
+        codes += position_scores * place_value
+    return codes
+
+
+def calculate_entropy_pattern_table(word_list: list[str],
+                                    block_size: int = PATTERN_BLOCK_SIZE) -> np.ndarray:
     """
     Precompute an N×N matrix where entry [i, j] encodes the Wordle score for
     guessing word i when the answer is word j, as a base-3 integer in [0, 242].
+
+    Rows are scored block_size guesses at a time against the whole vocabulary,
+    so the work is a handful of NumPy operations per block instead of N² Python calls.
     """
     n = len(word_list)
-    pattern_matrix = np.zeros((n, n), dtype=np.uint8)
-    # Each score is a 5-digit base-3 number; these are the place values (3^4 … 3^0).
-    powers_of_3 = np.array([81, 27, 9, 3, 1], dtype=np.uint8)
+    encoded = encode_words(word_list)
+    pattern_matrix = np.empty((n, n), dtype=np.uint8)
 
     print(f"Precomputing {n}x{n} pattern table (this might take a minute, but only happens once)...")
 
-    for i, guess in enumerate(word_list):
-        for j, answer in enumerate(word_list):
-            score_int = np.sum(np.array(score_guess(answer, guess)) * powers_of_3)
-            pattern_matrix[i, j] = score_int
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        pattern_matrix[start:stop] = _pattern_codes(encoded[start:stop], encoded)
 
     return pattern_matrix
@@ -0,0 +1,125 @@
+import json
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from Utilities.shared_utils import FEATURE_SIZE
+
+# Where the collector writes: the legacy single pickle, or numbered .npz shards.
+TRAINING_DATA_PATH = Path('ML/training_data/wordle_training.pkl')
+TRAINING_SHARD_DIR = Path('ML/training_data/shards')
+_SHARD_PATTERN = "shard_*.npz"
+
+# Bump whenever the consolidated layout changes so stale datasets are rebuilt.
+TRAINING_DATASET_VERSION = 1
+TRAINING_DATASET_DIR = Path('ML/training_data/dataset')
+_FEATURES_FILE = "features.npy"
+_LABELS_FILE = "labels.npy"
+_HEADER_FILE = "dataset.json"
+_LABEL_SIZE = 26
+
+
+def list_training_shards(shard_dir: Path = TRAINING_SHARD_DIR) -> list[Path]:
+    """Finished shards in shard_dir, in the order they were created."""
+    return sorted(shard_dir.glob(_SHARD_PATTERN))
+
+
+def _source_signature(shard_dir: Path, pickle_path: Path) -> list | None:
+    """
+    Identify the collector output the dataset is built from: the legacy pickle, if present,
+    followed by every finished shard. None when nothing has been collected.
+    """
+    sources = ([pickle_path] if pickle_path.exists() else []) + list_training_shards(shard_dir)
+    if not sources:
+        return None
+    return [[str(path), path.stat().st_size, path.stat().st_mtime_ns] for path in sources]
+
+
+def _read_pickle(path: Path) -> tuple[np.ndarray, np.ndarray]:
+    with open(path, 'rb') as f:
+        training_data = pickle.load(f)
+    return (np.array([example[0] for example in training_data], dtype=np.float32).reshape(-1, FEATURE_SIZE),
+            np.array([example[1] for example in training_data], dtype=np.float32).reshape(-1, _LABEL_SIZE))
+
+
+def _write_dataset(sources: list[Path], dataset_dir: Path) -> None:
+    """Copy the sources into preallocated features/labels .npy files, one source at a time."""
+    # The pickle has to be loaded whole to count its rows, so it is kept for the copy.
+    pickled = {path: _read_pickle(path) for path in sources if path.suffix == ".pkl"}
+    row_counts = []
+    for path in sources:
+        if path in pickled:
+            row_counts.append(len(pickled[path][1]))
+        else:
+            with np.load(path) as shard:
+                row_counts.append(len(shard["labels"]))
+
+    rows = sum(row_counts)
+    features = np.lib.format.open_memmap(dataset_dir / (_FEATURES_FILE + ".tmp"), mode="w+",
+                                         dtype=np.float32, shape=(rows, FEATURE_SIZE))
+    labels = np.lib.format.open_memmap(dataset_dir / (_LABELS_FILE + ".tmp"), mode="w+",
+                                       dtype=np.float32, shape=(rows, _LABEL_SIZE))
+    start = 0
+    for path, count in zip(sources, row_counts):
+        if path in pickled:
+            part_features, part_labels = pickled.pop(path)
+        else:
+            with np.load(path) as shard:
+                part_features, part_labels = shard["features"], shard["labels"]
+        features[start:start + count] = part_features
+        labels[start:start + count] = part_labels
+        start += count
+
+    features.flush()
+    labels.flush()
+    del features, labels
+    os.replace(dataset_dir / (_FEATURES_FILE + ".tmp"), dataset_dir / _FEATURES_FILE)
+    os.replace(dataset_dir / (_LABELS_FILE + ".tmp"), dataset_dir / _LABELS_FILE)
+
+
+def load_training_dataset(dataset_dir: Path = TRAINING_DATASET_DIR, shard_dir: Path = TRAINING_SHARD_DIR,
+                          pickle_path: Path = TRAINING_DATA_PATH) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Open the collected training data as contiguous, read-only memory-mapped arrays.
+
+    The collector's legacy pickle and its shards are consolidated together into
+    features.npy and labels.npy the first time, and again whenever the sources change;
+    a JSON header records which sources the arrays were built from.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: X float32 (N, 314) and y float32 (N, 26) memmaps.
+
+    Raises:
+        FileNotFoundError: No training data has been collected.
+    """
+    signature = _source_signature(shard_dir, pickle_path)
+    if signature is None:
+        raise FileNotFoundError(f"No training data in {shard_dir} or {pickle_path}")
+
+    header_path = dataset_dir / _HEADER_FILE
+    header = None
+    if header_path.exists():
+        with open(header_path, "r", encoding="utf-8") as f:
+            header = json.load(f)
+
+    if header != {"version": TRAINING_DATASET_VERSION, "sources": signature}:
+        print("Consolidating training data...")
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        header_path.unlink(missing_ok=True)
+        _write_dataset([Path(source[0]) for source in signature], dataset_dir)
+        with open(header_path, "w", encoding="utf-8") as f:
+            json.dump({"version": TRAINING_DATASET_VERSION, "sources": signature}, f)
+
+    return (np.load(dataset_dir / _FEATURES_FILE, mmap_mode="r"),
+            np.load(dataset_dir / _LABELS_FILE, mmap_mode="r"))
+
+
+def training_dataset_header(dataset_dir: Path = TRAINING_DATASET_DIR) -> dict:
+    """
+    The consolidated dataset's JSON header: its layout version and the collector output it
+    was built from. Call after load_training_dataset(), which keeps it current.
+    """
+    with open(dataset_dir / _HEADER_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
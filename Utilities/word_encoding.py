@@ -0,0 +1,60 @@
+import numpy as np
+
+# Arrays derived from the most recently used vocabulary, shared by every GameState and
+# model over it: (word_list, word count they were built for, {name: array}).
+_vocabulary_cache = (None, 0, {})
+
+
+def _vocabulary_arrays(word_list: list[str]) -> dict:
+    """The derived-array cache for word_list, emptied when the vocabulary changes or grows."""
+    global _vocabulary_cache
+    cached_list, cached_count, arrays = _vocabulary_cache
+    if cached_list is not word_list or cached_count != len(word_list):
+        arrays = {}
+        _vocabulary_cache = (word_list, len(word_list), arrays)
+    return arrays
+
+
+def encode_words(words: list[str]) -> np.ndarray:
+    """
+    Encode 5-letter words as an (n, 5) uint8 array of letter indices (0 = 'a').
+
+    Raises:
+        ValueError: A word contains a character other than lowercase a-z.
+    """
+    joined = "".join(words)
+    encoded = np.frombuffer(joined.encode("ascii", errors="replace"), dtype=np.uint8) - np.uint8(ord('a'))
+    # Anything below 'a' wraps around to >= 26, so one bound check catches every bad character.
+    if encoded.size and encoded.max() >= 26:
+        bad_word = next(word for word in words if not all('a' <= letter <= 'z' for letter in word))
+        raise ValueError(f"'{bad_word}' contains characters other than lowercase a-z")
+    return encoded.reshape(-1, 5)
+
+
+def letter_incidence(word_list: list[str]) -> np.ndarray:
+    """
+    Return an (N, 26) float32 array with a 1 where a word contains a letter (index 0 = 'a').
+
+    Repeated letters count once, so incidence @ letter_scores sums each word's unique-letter
+    scores. The matrix is built once per vocabulary and rebuilt when words are appended;
+    callers must not modify it.
+    """
+    arrays = _vocabulary_arrays(word_list)
+    if "letter_incidence" not in arrays:
+        incidence = np.zeros((len(word_list), 26), dtype=np.float32)
+        incidence[np.arange(len(word_list))[:, None], encode_words(word_list)] = 1.0
+        arrays["letter_incidence"] = incidence
+    return arrays["letter_incidence"]
+
+
+def alphabetical_rank(word_list: list[str]) -> np.ndarray:
+    """
+    Return an (N,) int array giving each word's position in sorted order, so comparing
+    ranks orders words alphabetically. Cached per vocabulary like letter_incidence().
+    """
+    arrays = _vocabulary_arrays(word_list)
+    if "alphabetical_rank" not in arrays:
+        rank = np.empty(len(word_list), dtype=np.int64)
+        rank[np.argsort(np.array(word_list), kind="stable")] = np.arange(len(word_list))
+        arrays["alphabetical_rank"] = rank
+    return arrays["alphabetical_rank"]
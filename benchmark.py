@@ -0,0 +1,212 @@
+import hashlib
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+import click
+import numpy as np
+
+import main
+import wordle
+from Utilities.pattern_table import build_pattern_table, load_pattern_table
+from Utilities.shared_utils import filter_words, score_guess, MAX_GUESSES
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is reported as null there.
+    resource = None
+
+BENCHMARK_SEED = 1234
+BENCHMARK_GAMES = 200
+BENCHMARK_OUTPUT = Path("benchmark_results.json")
+
+
+def _peak_rss_mb() -> float | None:
+    """Peak resident set size of this process so far, in MB."""
+    # Linux carries ru_maxrss across exec, so a freshly spawned process would report its
+    # parent's peak; VmHWM belongs to the new address space.
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def fixed_answer_set(word_list: list[str], games: int, seed: int = BENCHMARK_SEED) -> list[str]:
+    """Draw `games` distinct answers with a seeded RNG so every run plays the same words."""
+    return random.Random(seed).sample(word_list, min(games, len(word_list)))
+
+
+def benchmark_pattern_table(game_instance: wordle.Wordle, processes: int = 1, build: bool = True) -> dict:
+    """
+    Time building the pattern table from scratch, opening the saved copy, and reading it once.
+
+    The saved table is created first if missing so the load timings always measure a hit.
+    """
+    word_list = game_instance.word_list
+    results = {"build_seconds": None}
+
+    if build:
+        start = time.perf_counter()
+        build_pattern_table(word_list, processes)
+        results["build_seconds"] = round(time.perf_counter() - start, 3)
+
+    main.get_pattern_table(game_instance, processes)
+
+    start = time.perf_counter()
+    pattern_table = load_pattern_table(word_list, allow_prefix=True)
+    results["load_seconds"] = round(time.perf_counter() - start, 6)
+
+    start = time.perf_counter()
+    np.asarray(pattern_table).max()
+    results["first_read_seconds"] = round(time.perf_counter() - start, 3)
+    return results
+
+
+def _play_timed(bot, answer: str, latencies: list[float]) -> int | None:
+    """Play one game, appending each make_guess() latency. Returns the guesses used, or None if lost."""
+    for guess_number in range(1, MAX_GUESSES + 1):
+        start = time.perf_counter()
+        guess = bot.make_guess()
+        latencies.append(time.perf_counter() - start)
+        if guess == answer:
+            return guess_number
+        filter_words(guess, score_guess(answer, guess), bot.game_state, main.worker_pattern_table)
+    return None
+
+
+def benchmark_model(game_instance: wordle.Wordle, model: int, answers: list[str]) -> dict:
+    """
+    Solve every answer with one bot instance, resetting its game state between games.
+
+    Returns throughput, per-guess latency percentiles, and the guess-count distribution
+    (1..MAX_GUESSES, plus "failed").
+    """
+    start = time.perf_counter()
+    bot = main.initialize_bot(game_instance, model)
+    setup_seconds = time.perf_counter() - start
+
+    latencies = []
+    guesses = []
+    start = time.perf_counter()
+    for answer in answers:
+        bot.game_state.reset()
+        guesses.append(_play_timed(bot, answer, latencies))
+    play_seconds = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    summary = main.summarize_games(guesses)
+    return {
+        "model": main.model_options[model - 1],
+        "setup_seconds": round(setup_seconds, 3),
+        "games": summary["games"],
+        "games_per_second": round(len(answers) / play_seconds, 3),
+        "guess_latency_ms": {
+            "p50": round(float(np.percentile(latencies_ms, 50)), 3),
+            "p99": round(float(np.percentile(latencies_ms, 99)), 3),
+            "mean": round(float(latencies_ms.mean()), 3),
+        },
+        "win_rate": summary["win_rate"],
+        "average_guesses": summary["average_guesses"],
+        "guess_distribution": summary["guess_distribution"],
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _benchmark_model_in_subprocess(game_instance: wordle.Wordle, model: int, answers: list[str]) -> dict:
+    """
+    Run benchmark_model() in a freshly spawned interpreter, so setup starts cold (no table,
+    cache or bot left in main's globals) and peak RSS covers this model alone.
+    """
+    with get_context("spawn").Pool(1) as pool:
+        return pool.apply(benchmark_model, (game_instance, model, answers))
+
+
+def run_benchmark(game_instance: wordle.Wordle, models: list[int], games: int = BENCHMARK_GAMES,
+                  seed: int = BENCHMARK_SEED, processes: int = 1, build_table: bool = True) -> dict:
+    """
+    Run the pattern-table timings and then every requested model over the same fixed answer set,
+    each model in its own process.
+
+    Args:
+        game_instance: Game holding the word list.
+        models: Model numbers (1-based, as in main.model_options).
+        games: Size of the fixed answer set.
+        seed: Seed for the answer set.
+        processes: Worker processes for the pattern table build.
+        build_table: Also time a from-scratch pattern table build.
+
+    Returns:
+        dict: JSON-serializable results, including run metadata for comparing commits.
+    """
+    answers = fixed_answer_set(game_instance.word_list, games, seed)
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "word_count": len(game_instance.word_list),
+        "seed": seed,
+        "answers_sha256": hashlib.sha256("\n".join(answers).encode("utf-8")).hexdigest(),
+        "pattern_table": benchmark_pattern_table(game_instance, processes, build_table),
+        "models": [],
+    }
+
+    for model in models:
+        print(f"Benchmarking {main.model_options[model - 1]} on {len(answers)} games...")
+        results["models"].append(_benchmark_model_in_subprocess(game_instance, model, answers))
+
+    results["peak_rss_mb"] = _peak_rss_mb()
+    return results
+
+
+def write_results(results: dict, output: Path = BENCHMARK_OUTPUT) -> None:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Benchmark results written to {output}")
+
+
+@click.command()
+@click.option("--model", "-m", "models", multiple=True, type=click.IntRange(1, len(main.model_options)),
+              help="Model number to benchmark; repeat for several. Defaults to every model.")
+@click.option("--games", "-n", default=BENCHMARK_GAMES, show_default=True, type=click.IntRange(1, ),
+              help="Size of the fixed answer set.")
+@click.option("--seed", default=BENCHMARK_SEED, show_default=True, help="Seed for the answer set.")
+@click.option("--processes", "-p", default=1, show_default=True, type=click.IntRange(1, ),
+              help="Worker processes for the pattern table build.")
+@click.option("--skip-table-build", is_flag=True, help="Only time loading the saved pattern table.")
+@click.option("--output", "-o", default=BENCHMARK_OUTPUT, show_default=True, type=click.Path(path_type=Path),
+              help="Where to write the JSON results.")
+def bench(models, games, seed, processes, skip_table_build, output):
+    """Headless solver benchmark: throughput, latency, memory and guess distribution."""
+    game_instance = wordle.Wordle(Path("words.txt"))
+    models = list(models) or list(range(1, len(main.model_options) + 1))
+    results = run_benchmark(game_instance, models, games, seed, processes, not skip_table_build)
+    write_results(results, output)
+
+
+if __name__ == '__main__':
+    bench()
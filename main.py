@@ -1,21 +1,51 @@
 import time
+from collections import Counter
+from contextlib import contextmanager
 from pathlib import Path
-from random import choice
+from random import choice, Random
+import json
+import re
 import wordle
 from multiprocessing import Pool
 import click
-import pickle as pkl
-
-from Utilities.data_collector import TrainingDataCollector
-from Utilities.shared_utils import filter_words, score_guess, calculate_entropy_pattern_table, MAX_GUESSES
+import torch
+
+from Utilities.data_collector import TrainingDataCollector, GAMES_PER_SHARD
+from Utilities.guess_cache import GuessCache
+from Utilities.training_dataset import TRAINING_DATA_PATH, TRAINING_SHARD_DIR
+from Utilities.pattern_table import (build_pattern_table, load_pattern_table, save_pattern_table,
+                                    share_pattern_table, attach_pattern_table, GrowablePatternTable,
+                                    word_list_hash)
+from Utilities.shared_utils import filter_words, score_guess, play_lockstep, MAX_GUESSES
 from ML import (entropy_maximization_bot, random_forest_classifier,
                 random_forest_regressor, deep_q_network, neural_network_classifier)
 from Utilities import display
 
 TESTING_MODE = False
+# Intra-op torch threads per Pool worker; parallelism comes from the worker processes instead.
+_WORKER_TORCH_THREADS = 1
+# Most games a worker plays in lockstep, sharing one model call per turn.
+_LOCKSTEP_BATCH_SIZE = 64
+# Answers the solvers can play: exactly five lowercase letters a-z.
+_VALID_WORD = re.compile("[a-z]{5}")
 
 # Assigned lazily on first use; always set before any worker reads it.
 worker_pattern_table = None
+# Created the first time a user word is appended; holds the table for the session's vocabulary.
+growable_pattern_table = None
+# Entropy bot decisions keyed by game history; workers receive a private copy.
+worker_guess_cache = None
+# Models that are trained and saved to disk, by menu number.
+_TRAINABLE_MODELS = {
+    2: random_forest_classifier.RandomForestClassifierModel,
+    3: random_forest_regressor.RandomForestRegressorModel,
+    4: neural_network_classifier.NeuralNetworkClassifier,
+    5: deep_q_network.DQNBot,
+}
+# Built once per Pool worker by init_worker and reused for every game it plays.
+worker_bot = None
+# Bots reused across games in this process, keyed by model: (bot, word count it was built for).
+_bot_cache = {}
 model_options = ["Entropy Maximization", "Random Forest Classifier", "Random Forest Regressor",
                  "Neural Network Classifier", "Deep Q-Network"]
 
@@ -27,7 +57,7 @@ def _startup(game_instance: wordle.Wordle):
         usr_input = click.prompt("Please Choose an Option", type=click.Choice(["1", "2", "3", "4", "5", "q"]),
                                  show_choices=False)
         if usr_input == "1":
-            usr_word = _handle_user_word(game_instance)
+            usr_word = _handle_user_word(game_instance, model)
             print(_play_game(game_instance, model, usr_word))
         elif usr_input == "2":
             rnd_word = _rand_word(game_instance.word_list)
@@ -37,12 +67,9 @@ def _startup(game_instance: wordle.Wordle):
             TESTING_MODE = True
             testing_range = click.prompt("Enter the Number of Tests You Would Like to Run",
                                          type=click.IntRange(1, ), show_choices=False)
-            if model < 4:
-                processes = click.prompt("How Many Parallel Processes Should be Used",
-                                         type=click.IntRange(1, 20), show_choices=True)
-                _test_bot(game_instance, testing_range, processes, model)
-            else:
-                _test_non_parallel_models(game_instance, testing_range, model)
+            processes = click.prompt("How Many Parallel Processes Should be Used",
+                                     type=click.IntRange(1, 20), show_choices=True)
+            _test_bot(game_instance, testing_range, processes, model)
             print("Testing Complete! Returning To Main Menu...")
         elif usr_input == "4":
             testing_range = click.prompt("Enter the Number of Games to Collect Data From",
@@ -64,25 +91,46 @@ def _startup(game_instance: wordle.Wordle):
             exit()
 
 
-def _handle_user_word(instance: wordle.Wordle) -> str:
+def _handle_user_word(instance: wordle.Wordle, model: int) -> str:
     """
     Prompt the user for a 5-letter answer word.
 
-    Words not in the standard list are added to word_list and flagged for
-    pattern table recomputation so the entropy bot remains consistent.
+    Words not in the standard list are appended to word_list; get_pattern_table() extends
+    the pattern table with their rows and columns before the next game.
     """
     while True:
-        word = click.prompt("Please Enter a 5-Character String or Enter 'q' to Exit", type=str)
+        word = click.prompt("Please Enter a 5-Character String or Enter 'q' to Exit", type=str).strip().lower()
         if word == "q":
             exit()
-        if len(word) != 5:
+        if not _VALID_WORD.fullmatch(word):
             continue
-        if word not in game.word_list:
-            instance.needRecompute = True
-            instance.word_list.append(word)
+        problem = _unplayable_words_message(instance, model, [word])
+        if problem is not None:
+            print(problem)
+            continue
+        _add_word(instance, word)
         return word
 
 
+def _unplayable_words_message(instance: wordle.Wordle, model: int, words: list[str]) -> str | None:
+    """
+    Explain why `model` cannot play the words of `words` that are outside the word list, or
+    return None when it can. Every model handles appended words except a DQN with the full
+    output head, which has exactly one output per word it was trained on.
+    """
+    vocabulary = set(instance.word_list)
+    unknown = [word for word in dict.fromkeys(words) if word not in vocabulary]
+    if not unknown or model != 5 or deep_q_network.DQNBot.saved_head() == deep_q_network.LETTER_POSITION_HEAD:
+        return None
+    return (f"The Deep Q-Network can only play words from the word list (not in it: {', '.join(unknown)}). "
+            f"Train it with --head {deep_q_network.LETTER_POSITION_HEAD} to play new words.")
+
+
+def _add_word(instance: wordle.Wordle, word: str) -> None:
+    if word not in instance.word_list:
+        instance.word_list.append(word)
+
+
 def _rand_word(words: list[str]) -> str:
     word = choice(tuple(words))
     if not TESTING_MODE:
@@ -90,9 +138,24 @@ def _rand_word(words: list[str]) -> str:
     return word
 
 
+def _get_bot(game_instance: wordle.Wordle, model: int):
+    """
+    Return a ready bot for `model`, constructing (and loading or training) it only once per process.
+
+    A bot is rebuilt when words were appended since it was created, because its
+    game state and pattern table only cover the old vocabulary.
+    """
+    bot, word_count = _bot_cache.get(model, (None, 0))
+    if bot is None or word_count != len(game_instance.word_list):
+        bot = initialize_bot(game_instance, model)
+        _bot_cache[model] = (bot, len(game_instance.word_list))
+    bot.game_state.reset()
+    return bot
+
+
 def _play_game(game_instance: wordle.Wordle, model: int, word: str = "") -> str:
     display.print_game_start()
-    bot = initialize_bot(game_instance, model)
+    bot = _get_bot(game_instance, model)
 
     guess_count = 0
     guesses = []
@@ -107,77 +170,203 @@ def _play_game(game_instance: wordle.Wordle, model: int, word: str = "") -> str:
             display.print_end_screen(word, guess_count)
             return ""
 
-        filter_words(guess, score, bot.game_state)
+        filter_words(guess, score, bot.game_state, worker_pattern_table)
         display.print_game_state(guesses)
 
     return "Word Not Guessed :("
 
 
-def init_worker(pattern_table):
-    global worker_pattern_table
-    worker_pattern_table = pattern_table
+def init_worker(pattern_table_handle, guess_cache, word_list: list[str], model: int):
+    global worker_pattern_table, worker_guess_cache, worker_bot
+    torch.set_num_threads(_WORKER_TORCH_THREADS)
+    worker_pattern_table = attach_pattern_table(pattern_table_handle)
+    worker_guess_cache = guess_cache
+    worker_bot = _create_worker_bot(word_list, model)
+
+
+def summarize_games(guesses: list[int | None]) -> dict:
+    """
+    Win rate, average guesses and guess-count distribution for a set of games.
+
+    Args:
+        guesses: Guesses each game used, counted from 1; None for a lost game.
+
+    Returns:
+        dict: games; win_rate (0-1, None without games); average_guesses over won games
+        (None without wins); guess_distribution, games per count "1".."MAX_GUESSES" and "failed".
+    """
+    distribution = Counter(guesses)
+    wins = len(guesses) - distribution[None]
+    winning_guesses = sum(count * games for count, games in distribution.items() if count is not None)
+    return {
+        "games": len(guesses),
+        "win_rate": round(wins / len(guesses), 4) if guesses else None,
+        "average_guesses": round(winning_guesses / wins, 3) if wins else None,
+        "guess_distribution": {str(n): distribution[n] for n in range(1, MAX_GUESSES + 1)}
+        | {"failed": distribution[None]},
+    }
 
 
-def _test_bot(game_instance: wordle.Wordle, testing_runs: int, processes: int = 2, model: int = 1):
-    correct_games = 0
-    incorrect_games = 0
-    guess_counts = []
+def _guesses_used(guess_count: int) -> int | None:
+    """Convert a _run_single_game() result to guesses counted from 1, or None for a lost game."""
+    return guess_count + 1 if guess_count < MAX_GUESSES else None
+
+
+@contextmanager
+def _worker_pool(game_instance: wordle.Wordle, processes: int, model: int):
+    """
+    Prepare `model` once in this process, then yield a Pool whose workers share
+    the pattern table and guess cache.
+    """
     pattern_table = None
+    guess_cache = None
 
     if model != 1:
-        initialize_bot(game_instance, model)
+        _get_bot(game_instance, model)  # train and save once here so workers only load
     else:
-        pattern_table = get_pattern_table(game_instance)
-
-    with Pool(processes, initializer=init_worker, initargs=(pattern_table,)) as pool:
-        args = [(_rand_word(game_instance.word_list), game_instance.word_list, model) for _ in range(testing_runs)]
-        results = pool.map(_run_single_game, args)
-        for result in results:
-            if result > MAX_GUESSES - 1:
-                incorrect_games += 1
-            else:
-                correct_games += 1
-                guess_counts.append(result)
-
-    print(f"\n\nCorrect Games Percentage: {round((correct_games / testing_runs) * 100, 2)}%")
-    print(f"Incorrect Games Percentage: {round((incorrect_games / testing_runs) * 100, 2)}%")
-    print("Average Number of Guesses: ", round(sum(guess_counts) / len(guess_counts), 2))
-
-
-def _test_non_parallel_models(game_instance: wordle.Wordle, testing_runs: int, model: int = 1):
-    correct_games = 0
-    incorrect_games = 0
-    guess_counts = []
-    if model != 1:
-        initialize_bot(game_instance, model)
-    for i in range(testing_runs):
-        guess_count = _run_single_game((_rand_word(game_instance.word_list), game_instance.word_list, model))
-        if guess_count < MAX_GUESSES:
-            guess_counts.append(guess_count)
-            correct_games += 1
-        else:
-            incorrect_games += 1
-    print(f"\n\nCorrect Games Percentage: {round((correct_games / testing_runs) * 100, 2)}%")
-    print(f"Incorrect Games Percentage: {round((incorrect_games / testing_runs) * 100, 2)}%")
-    print("Average Number of Guesses: ", round(sum(guess_counts) / len(guess_counts), 2))
-
-
-def _run_single_game(args) -> int:
-    word, word_list, model = args
+        pattern_table = get_pattern_table(game_instance, processes)
+        guess_cache = get_guess_cache(game_instance)
+
+    with share_pattern_table(pattern_table) as pattern_table_handle:
+        initargs = (pattern_table_handle, guess_cache, game_instance.word_list, model)
+        with Pool(processes, initializer=init_worker, initargs=initargs) as pool:
+            yield pool
+
+
+def _test_bot(game_instance: wordle.Wordle, testing_runs: int, processes: int = 2, model: int = 1,
+              answers: list[str] = None) -> dict:
+    """
+    Play testing_runs games across a process pool and report the results.
+
+    Args:
+        answers: Answer words to play; drawn at random with _rand_word when omitted.
+    """
+    if answers is None:
+        answers = [_rand_word(game_instance.word_list) for _ in range(testing_runs)]
+
+    # Enough batches to keep every worker busy, each as large as possible up to _LOCKSTEP_BATCH_SIZE.
+    batch_size = max(1, min(_LOCKSTEP_BATCH_SIZE, -(-len(answers) // processes)))
+    batches = [answers[i:i + batch_size] for i in range(0, len(answers), batch_size)]
+    with _worker_pool(game_instance, processes, model) as pool:
+        results = [result for batch in pool.map(_run_game_batch, batches) for result in batch]
+
+    summary = {"model": model_options[model - 1]} | summarize_games([_guesses_used(result) for result in results])
+    if summary["win_rate"] is not None:
+        print(f"\n\nCorrect Games Percentage: {round(summary['win_rate'] * 100, 2)}%")
+        print(f"Incorrect Games Percentage: {round((1 - summary['win_rate']) * 100, 2)}%")
+    print("Average Number of Guesses: ", summary["average_guesses"])
+    return summary
 
+
+def _load_partial_results(results_path: Path) -> dict:
+    """
+    Read the per-word results of an earlier, possibly interrupted, exhaustive run.
+
+    A torn final line left by an interruption is truncated away so appending resumes cleanly.
+
+    Returns:
+        dict: word -> guesses needed (None if the game was lost).
+    """
+    results = {}
+    if not results_path.exists():
+        return results
+
+    valid_bytes = 0
+    with open(results_path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            results[record["word"]] = record["guesses"]
+            valid_bytes += len(line)
+
+    if valid_bytes < results_path.stat().st_size:
+        with open(results_path, "r+b") as f:
+            f.truncate(valid_bytes)
+    return results
+
+
+def _run_answers(words: list[str]) -> list[tuple[str, int]]:
+    return list(zip(words, _run_game_batch(words)))
+
+
+def _evaluate_all_words(game_instance: wordle.Wordle, model: int, processes: int, results_path: Path,
+                        answers: list[str] = None, chunksize: int = 16) -> dict:
+    """
+    Play every answer exactly once and report a guess-count histogram.
+
+    Each finished game is appended to results_path as a JSON line, {"word": ..., "guesses": n},
+    with guesses counted from 1 and null for a lost game. Words already in the file are
+    skipped, so an interrupted run picks up where it stopped.
+
+    Args:
+        answers: Words to play; defaults to the whole word list. They are lowercased, blank
+            lines are skipped and duplicates are played once.
+        chunksize: Games handed to a worker at a time, played in lockstep where the model supports it.
+
+    Returns:
+        dict: summarize_games() over all answers, with the model name.
+    """
+    answers = [word.lower() for word in answers] if answers is not None else game_instance.word_list
+    answers = list(dict.fromkeys(word for word in answers if word))
+    invalid = [word for word in answers if not _VALID_WORD.fullmatch(word)]
+    if invalid:
+        raise click.UsageError(f"Answers must be five letters a-z (not: {', '.join(invalid)})")
+    problem = _unplayable_words_message(game_instance, model, answers)
+    if problem is not None:
+        raise click.UsageError(problem)
+    for word in answers:
+        _add_word(game_instance, word)
+
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results = _load_partial_results(results_path)
+    pending = [word for word in answers if word not in results]
+    print(f"{len(answers) - len(pending)} of {len(answers)} words already played; playing {len(pending)}...")
+
+    with open(results_path, "a", encoding="utf-8") as f:
+        with _worker_pool(game_instance, processes, model) as pool:
+            batches = [pending[i:i + chunksize] for i in range(0, len(pending), chunksize)]
+            _record_results((game for batch in pool.imap_unordered(_run_answers, batches) for game in batch),
+                            results, f)
+
+    summary = {"model": model_options[model - 1]} | summarize_games([results[word] for word in answers])
+    display.print_histogram(summary["guess_distribution"], len(answers))
+    return summary
+
+
+def _record_results(game_results, results: dict, f) -> None:
+    for word, guess_count in game_results:
+        guesses = _guesses_used(guess_count)
+        results[word] = guesses
+        f.write(json.dumps({"word": word, "guesses": guesses}) + "\n")
+        f.flush()
+
+
+def _create_worker_bot(word_list: list[str], model: int):
+    """Build the bot a worker reuses for all of its games; saved models are loaded from disk once."""
     if model == 1:
-        bot = entropy_maximization_bot.EntropyBot(word_list, worker_pattern_table)
-    elif model == 2:
-        bot = random_forest_classifier.RandomForestClassifierModel(word_list)
-    elif model == 3:
-        bot = random_forest_regressor.RandomForestRegressorModel(word_list)
-    elif model == 4:  # Neural net cannot run in parallel; should never reach here via _test_bot
-        bot = neural_network_classifier.NeuralNetworkClassifier(word_list)
-    else:
-        bot = deep_q_network.DQNBot(word_list)
+        return entropy_maximization_bot.EntropyBot(word_list, worker_pattern_table, worker_guess_cache)
+    return _trained_bot(word_list, model)
+
 
-    if model != 1 and not bot.is_trained:
-        bot.train()
+def _trained_bot(word_list: list[str], model: int):
+    """Build one of the _TRAINABLE_MODELS, loading its saved model or training it if there is none."""
+    bot = _TRAINABLE_MODELS[model](word_list)
+    bot.train()
+    return bot
+
+
+def _run_game_batch(words: list[str]) -> list[int]:
+    """Play words on this worker's bot: in lockstep when it can guess for many games at once."""
+    if hasattr(worker_bot, "make_guesses"):
+        return play_lockstep(worker_bot, words, worker_pattern_table)
+    return [_run_single_game(word) for word in words]
+
+
+def _run_single_game(word: str) -> int:
+    bot = worker_bot
+    bot.game_state.reset()
 
     guess_count = 0
     while guess_count < MAX_GUESSES:
@@ -185,18 +374,30 @@ def _run_single_game(args) -> int:
         if guess == word:
             return guess_count
         score = score_guess(word, guess)
-        filter_words(guess, score, bot.game_state)
+        filter_words(guess, score, bot.game_state, worker_pattern_table)
         guess_count += 1
     return guess_count
 
 
-def _gather_testing_data(game_instance: wordle.Wordle, game_count: int, process_count: int):
-    pattern_table = get_pattern_table(game_instance)
+def _gather_testing_data(game_instance: wordle.Wordle, game_count: int, process_count: int, k: int = 10,
+                         streaming: bool = True, games_per_shard: int = GAMES_PER_SHARD, resume: bool = False,
+                         output: Path = None, seed: int = None):
+    pattern_table = get_pattern_table(game_instance, process_count)
     collector = TrainingDataCollector(game_instance.word_list, pattern_table)
 
     start_time = time.time()
     print(f"Collecting data from {game_count} games...")
-    collector.collect_training_data_parallel(num_games=game_count, k=10, processes=process_count)
+    if streaming:
+        shard_dir = output or TRAINING_SHARD_DIR
+        shards = collector.collect_training_data_streaming(num_games=game_count, k=k, processes=process_count,
+                                                           shard_dir=shard_dir, games_per_shard=games_per_shard,
+                                                           resume=resume, seed=seed)
+        print(f"Time taken: {time.time() - start_time:.1f}s")
+        print(f"{len(shards)} shards in {shard_dir}")
+        return
+
+    collector.collect_training_data_parallel(num_games=game_count, k=k, processes=process_count,
+                                             output=output or TRAINING_DATA_PATH, seed=seed)
     elapsed = time.time() - start_time
 
     print(f"Time taken: {elapsed:.1f}s")
@@ -205,46 +406,228 @@ def _gather_testing_data(game_instance: wordle.Wordle, game_count: int, process_
     print(f"Label shape: {collector.training_data[0][1].shape}")
 
 
-def get_pattern_table(game_instance: wordle.Wordle):
-    global worker_pattern_table
-    path = Path("ML/saved_models/pattern_table.pkl")
+def get_pattern_table(game_instance: wordle.Wordle, processes: int = 1):
+    """
+    Return the pattern table for the current word list.
+
+    The saved table is memory-mapped from disk when its header matches the word list;
+    it is only rebuilt (with `processes` workers) and rewritten when missing or stale.
+    A saved table covering only a prefix of the words loaded from the file (the file
+    gained words since) is extended to all of them and saved once. Words appended by
+    _handle_user_word are added incrementally in memory and never written back, so the
+    file on disk keeps matching words.txt.
+    """
+    global worker_pattern_table, growable_pattern_table
+    word_list = game_instance.word_list
+    base_words = word_list[:game_instance.base_word_count]
+
+    if worker_pattern_table is None:
+        worker_pattern_table = load_pattern_table(word_list, allow_prefix=True)
+        if worker_pattern_table is None:
+            worker_pattern_table = build_pattern_table(base_words, processes)
+            worker_pattern_table = save_pattern_table(worker_pattern_table, base_words)
+        elif len(worker_pattern_table) < len(base_words):
+            extended = GrowablePatternTable(worker_pattern_table, base_words).extend(base_words)
+            worker_pattern_table = save_pattern_table(extended, base_words)
+
+    if len(worker_pattern_table) < len(word_list):
+        if growable_pattern_table is None:
+            growable_pattern_table = GrowablePatternTable(worker_pattern_table, word_list)
+        worker_pattern_table = growable_pattern_table.extend(word_list)
+
+    return worker_pattern_table
 
-    if path.exists():
-        with open(path, 'rb') as f:
-            worker_pattern_table = pkl.load(f)
 
-    if worker_pattern_table is None or game_instance.needRecompute:
-        worker_pattern_table = calculate_entropy_pattern_table(game_instance.word_list)
-        game_instance.needRecompute = False
+def get_guess_cache(game_instance: wordle.Wordle):
+    """
+    Return the entropy bot's decision cache for the current word list.
 
-    with open(path, 'wb') as f:
-        pkl.dump(worker_pattern_table, f)
+    Loaded from disk when it matches the word list; otherwise the opening moves are
+    precomputed once and, for the words.txt vocabulary, saved so later runs skip
+    entropy scoring for them.
+    """
+    global worker_guess_cache
+    word_list = game_instance.word_list
 
-    return worker_pattern_table
+    if worker_guess_cache is None or worker_guess_cache.word_list_hash != word_list_hash(word_list):
+        worker_guess_cache = GuessCache.load(word_list)
+        if len(worker_guess_cache) == 0:
+            print("Precomputing the entropy bot's opening moves...")
+            bot = entropy_maximization_bot.EntropyBot(word_list, get_pattern_table(game_instance),
+                                                      worker_guess_cache)
+            worker_guess_cache.warm(bot)
+            # Like the pattern table, nothing derived from session-only words is written to disk.
+            if len(word_list) == game_instance.base_word_count:
+                worker_guess_cache.save()
+
+    return worker_guess_cache
 
 
 def initialize_bot(game_instance: wordle.Wordle, model: int = 1):
     if model == 1:
-        return entropy_maximization_bot.EntropyBot(game_instance.word_list, get_pattern_table(game_instance))
-    elif model == 2:
-        bot = random_forest_classifier.RandomForestClassifierModel(game_instance.word_list)
-        bot.train()
-        return bot
-    elif model == 3:
-        bot = random_forest_regressor.RandomForestRegressorModel(game_instance.word_list)
-        bot.train()
-        return bot
-    elif model == 4:
-        bot = neural_network_classifier.NeuralNetworkClassifier(game_instance.word_list)
-        bot.train()
-    else:
-        bot = deep_q_network.DQNBot(game_instance.word_list)
-        bot.train()
-    return bot
+        return entropy_maximization_bot.EntropyBot(game_instance.word_list, get_pattern_table(game_instance),
+                                                   get_guess_cache(game_instance))
+    return _trained_bot(game_instance.word_list, model)
+
+
+def _write_json(data, output: Path) -> None:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    print(f"Results written to {output}")
+
+
+@click.group(invoke_without_command=True)
+@click.option("--words", "word_list_path", default=Path("words.txt"), show_default=True,
+              type=click.Path(path_type=Path), help="Word list to load.")
+@click.pass_context
+def cli(ctx, word_list_path):
+    """Wordle solver. Without a command, starts the interactive menu."""
+    game_instance = wordle.Wordle(word_list_path)
+    ctx.obj = game_instance
+    if ctx.invoked_subcommand is None:
+        print(f"Successfully Loaded {len(game_instance.word_list)} Words Into The Game!\n\n")
+        _startup(game_instance)
+
+
+_model_option = click.option("--model", "-m", default=1, show_default=True,
+                             type=click.IntRange(1, len(model_options)),
+                             help="1 Entropy, 2 RF Classifier, 3 RF Regressor, 4 Neural Net, 5 DQN.")
+_processes_option = click.option("--processes", "-p", default=1, show_default=True, type=click.IntRange(1, ),
+                                 help="Parallel worker processes.")
+_seed_option = click.option("--seed", type=int, default=None, help="Seed for randomly chosen answers.")
+
+
+@cli.command()
+@click.argument("words", nargs=-1)
+@_model_option
+@click.option("--random", "-r", "random_games", default=0, type=click.IntRange(0, ),
+              help="Also solve this many randomly chosen words.")
+@_seed_option
+@click.pass_obj
+def solve(game_instance, words, model, random_games, seed):
+    """Solve WORDS (and/or random words), printing each game."""
+    global TESTING_MODE
+    TESTING_MODE = True
+    words = [word.lower() for word in words]
+    for word in words:
+        if not _VALID_WORD.fullmatch(word):
+            raise click.BadParameter(f"'{word}' is not five letters a-z", param_hint="WORDS")
+    problem = _unplayable_words_message(game_instance, model, words)
+    if problem is not None:
+        raise click.UsageError(problem)
+    for word in words:
+        _add_word(game_instance, word)
+
+    rng = Random(seed)
+    words += [rng.choice(game_instance.word_list) for _ in range(random_games)]
+    for word in words:
+        print(f"\nSolving {word}")
+        print(_play_game(game_instance, model, word))
+
+
+@cli.command()
+@_model_option
+@click.option("--games", "-n", default=1000, show_default=True, type=click.IntRange(1, ),
+              help="Number of games to play.")
+@_processes_option
+@_seed_option
+@click.option("--output", "-o", type=click.Path(path_type=Path), help="Write the summary as JSON.")
+@click.pass_obj
+def bench(game_instance, model, games, processes, seed, output):
+    """Play many games and report win rate and average guesses."""
+    global TESTING_MODE
+    TESTING_MODE = True
+    rng = Random(seed)
+    answers = [rng.choice(game_instance.word_list) for _ in range(games)]
+    summary = _test_bot(game_instance, games, processes, model, answers)
+    if output is not None:
+        _write_json(summary | {"seed": seed, "processes": processes}, output)
+
+
+@cli.command()
+@_model_option
+@_processes_option
+@click.option("--answers", "answers_path", type=click.Path(exists=True, path_type=Path),
+              help="File of answer words, one per line. Defaults to the whole word list.")
+@click.option("--output", "-o", type=click.Path(path_type=Path),
+              help="Per-word results (JSON lines). Defaults to results/exhaustive_model<N>.jsonl.")
+@click.option("--chunksize", default=16, show_default=True, type=click.IntRange(1, ),
+              help="Games handed to a worker at a time.")
+@click.option("--fresh", is_flag=True, help="Discard earlier results instead of resuming from them.")
+@click.pass_obj
+def evaluate(game_instance, model, processes, answers_path, output, chunksize, fresh):
+    """Play every word exactly once and report a guess-count histogram."""
+    output = output or Path(f"results/exhaustive_model{model}.jsonl")
+    if fresh:
+        output.unlink(missing_ok=True)
+    answers = wordle.Wordle(answers_path).word_list if answers_path else None
+    summary = _evaluate_all_words(game_instance, model, processes, output, answers, chunksize)
+    _write_json(summary, output.with_suffix(".summary.json"))
+
+
+@cli.command()
+@click.option("--games", "-n", default=1000, show_default=True, type=click.IntRange(1, ),
+              help="Number of games to collect data from.")
+@_processes_option
+@click.option("-k", "k", default=10, show_default=True, type=click.IntRange(1, ),
+              help="Top-entropy words used to build each label.")
+@click.option("--streaming/--pickle", default=True, show_default=True,
+              help=f"Write .npz shards to {TRAINING_SHARD_DIR} as games finish, or one pickle at the end.")
+@click.option("--games-per-shard", default=GAMES_PER_SHARD, show_default=True, type=click.IntRange(1, ),
+              help="Games per shard when streaming.")
+@click.option("--resume", is_flag=True,
+              help="When streaming, top the shards up to --games in total instead of adding --games more.")
+@click.option("--output", "--shard-dir", "-o", "output", type=click.Path(path_type=Path),
+              help=f"Shard directory when streaming, or pickle file with --pickle. Training reads "
+                   f"{TRAINING_SHARD_DIR} and {TRAINING_DATA_PATH}.")
+@_seed_option
+@click.pass_obj
+def collect(game_instance, games, processes, k, streaming, games_per_shard, resume, output, seed):
+    """Generate training data for the supervised models."""
+    _gather_testing_data(game_instance, games, processes, k, streaming, games_per_shard, resume, output, seed)
+
+
+@cli.command("build-table")
+@_processes_option
+@click.option("--force", is_flag=True, help="Rebuild even if the saved table is current.")
+@click.pass_obj
+def build_table(game_instance, processes, force):
+    """Build and save the pattern table and warm the entropy bot's opening-move cache."""
+    global worker_pattern_table
+    if force:
+        worker_pattern_table = save_pattern_table(build_pattern_table(game_instance.word_list, processes),
+                                                  game_instance.word_list)
+    start_time = time.time()
+    pattern_table = get_pattern_table(game_instance, processes)
+    get_guess_cache(game_instance)
+    print(f"Pattern table {pattern_table.shape[0]}x{pattern_table.shape[1]} ready "
+          f"({time.time() - start_time:.1f}s)")
+
+
+@cli.command()
+@click.option("--model", "-m", default=5, show_default=True, type=click.IntRange(2, len(model_options)),
+              help="2 RF Classifier, 3 RF Regressor, 4 Neural Net, 5 DQN.")
+@click.option("--force", is_flag=True, help="Discard the saved model and train from scratch.")
+@click.option("--prioritized-replay", is_flag=True, help="DQN only: replay transitions by TD error.")
+@click.option("--head", type=click.Choice([deep_q_network.FULL_HEAD, deep_q_network.LETTER_POSITION_HEAD]),
+              help="DQN only: output layer for a newly trained network.  [default: full]")
+@click.pass_obj
+def train(game_instance, model, force, prioritized_replay, head):
+    """Train (or load) a model and save it to ML/saved_models/."""
+    if (prioritized_replay or head) and model != 5:
+        raise click.UsageError("--prioritized-replay and --head only apply to the DQN (model 5).")
+    options = {"prioritized_replay": True} if prioritized_replay else {}
+    if head:
+        options["head"] = head
+    bot = _TRAINABLE_MODELS[model](game_instance.word_list, **options)
+    if force:
+        bot.model_path.unlink(missing_ok=True)
+        if hasattr(bot, "checkpoint_path"):
+            bot.checkpoint_path.unlink(missing_ok=True)
+    bot.train()
+    print(f"{model_options[model - 1]} is trained.")
 
 
 if __name__ == '__main__':
-    word_list_path = Path("words.txt")
-    game = wordle.Wordle(word_list_path)
-    print(f"Successfully Loaded {len(game.word_list)} Words Into The Game!\n\n")
-    _startup(game)
+    cli()
@@ -12,5 +12,6 @@ class Wordle:
             print(f"An unexpected error occurred while loading words.txt: {e}")
             exit()
 
-        self.needRecompute = False
+        # Words loaded from the file; session words are appended after them and never saved.
+        self.base_word_count = len(self.word_list)
 